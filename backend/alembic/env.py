@@ -26,6 +26,14 @@ if config.config_file_name is not None:
 # Target metadata for autogenerate
 target_metadata = Base.metadata
 
+# Created by data migrations, not by the models
+UNMANAGED_TABLES = {"migration_archive"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Keep autogenerate from dropping tables that have no model"""
+    return not (type_ == "table" and name in UNMANAGED_TABLES)
+
 
 def run_migrations_offline() -> None:
     """
@@ -40,6 +48,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -61,6 +70,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
             compare_type=True,  # Detect column type changes
             compare_server_default=True,  # Detect default value changes
         )
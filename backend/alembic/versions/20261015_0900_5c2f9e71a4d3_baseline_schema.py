@@ -0,0 +1,263 @@
+"""Baseline schema - tables, indexes and constraints
+
+Revision ID: 5c2f9e71a4d3
+Revises: bcecdc349185
+Create Date: 2026-10-15 09:00:00.000000
+
+Until now tables were created by Base.metadata.create_all() at startup,
+so the initial migration is empty. This revision creates any missing
+tables, and brings databases created by create_all() up to date with
+the current models (fields_hash column, composite/covering indexes,
+RESTRICT on projects.field_template_id).
+
+Duplicate review records that would violate the new unique index are
+not discarded: all but the latest per field are moved, as JSON, into
+migration_archive so reviewer edits can be recovered by hand.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2f9e71a4d3'
+down_revision: Union[str, None] = 'bcecdc349185'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+project_status = sa.Enum("ACTIVE", "ARCHIVED", name="projectstatus")
+upload_status = sa.Enum("UPLOADED", "PARSING", "PARSED", "FAILED", name="uploadstatus")
+extraction_status = sa.Enum("PENDING", "IN_PROGRESS", "COMPLETED", "FAILED", name="extractionstatus")
+review_status = sa.Enum(
+    "CONFIRMED", "REJECTED", "MANUAL_UPDATED", "MISSING_DATA", "PENDING",
+    name="reviewstatus"
+)
+
+
+# Rows removed by data migrations, kept as JSON so later column changes
+# to the source tables don't break the archive
+MIGRATION_ARCHIVE_TABLE = """
+    CREATE TABLE IF NOT EXISTS migration_archive (
+        id BIGSERIAL PRIMARY KEY,
+        revision VARCHAR(32) NOT NULL,
+        source_table VARCHAR(63) NOT NULL,
+        data JSONB NOT NULL,
+        archived_at TIMESTAMP NOT NULL DEFAULT now()
+    )
+"""
+
+
+def _index_names(inspector, table: str) -> set:
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def _create_index_if_missing(inspector, name: str, table: str, columns: list, **kwargs) -> None:
+    if name not in _index_names(inspector, table):
+        op.create_index(name, table, columns, **kwargs)
+
+
+def _drop_index_if_present(inspector, name: str, table: str) -> None:
+    if name in _index_names(inspector, table):
+        op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    # field_templates
+    if "field_templates" not in existing_tables:
+        op.create_table(
+            "field_templates",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("fields", sa.JSON(), nullable=False),
+            sa.Column("fields_hash", sa.String(64), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_field_templates_name", "field_templates", ["name"])
+    else:
+        columns = {column["name"] for column in inspector.get_columns("field_templates")}
+        if "fields_hash" not in columns:
+            op.add_column("field_templates", sa.Column("fields_hash", sa.String(64), nullable=True))
+
+    # projects
+    if "projects" not in existing_tables:
+        op.create_table(
+            "projects",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column(
+                "field_template_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("field_templates.id", ondelete="RESTRICT"),
+                nullable=True
+            ),
+            sa.Column("status", project_status, nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_projects_name", "projects", ["name"])
+    else:
+        # Let the FK reject deleting a template that is still in use
+        for fk in inspector.get_foreign_keys("projects"):
+            if fk["constrained_columns"] == ["field_template_id"] and \
+                    (fk.get("options") or {}).get("ondelete") != "RESTRICT":
+                op.drop_constraint(fk["name"], "projects", type_="foreignkey")
+                op.create_foreign_key(
+                    "projects_field_template_id_fkey",
+                    "projects", "field_templates",
+                    ["field_template_id"], ["id"],
+                    ondelete="RESTRICT"
+                )
+
+    # documents
+    if "documents" not in existing_tables:
+        op.create_table(
+            "documents",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "project_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("projects.id"),
+                nullable=False
+            ),
+            sa.Column("filename", sa.String(500), nullable=False),
+            sa.Column("file_type", sa.String(50), nullable=False),
+            sa.Column("file_size", sa.BigInteger(), nullable=False),
+            sa.Column("file_path", sa.Text(), nullable=False),
+            sa.Column("upload_status", upload_status, nullable=False),
+            sa.Column("parsed_text", sa.Text(), nullable=True),
+            sa.Column("file_metadata", sa.JSON(), nullable=True),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+    else:
+        # Superseded by the (project_id, created_at) index
+        _drop_index_if_present(inspector, "ix_documents_project_id", "documents")
+    _create_index_if_missing(
+        inspector, "ix_documents_project_created", "documents", ["project_id", "created_at"]
+    )
+
+    # extracted_records
+    if "extracted_records" not in existing_tables:
+        op.create_table(
+            "extracted_records",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "document_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("documents.id"),
+                nullable=False
+            ),
+            sa.Column(
+                "field_template_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("field_templates.id"),
+                nullable=False
+            ),
+            sa.Column("extraction_status", extraction_status, nullable=False),
+            sa.Column("extracted_fields", sa.JSON(), nullable=True),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+    else:
+        # Superseded by the (document_id, created_at) index
+        _drop_index_if_present(inspector, "ix_extracted_records_document_id", "extracted_records")
+    _create_index_if_missing(
+        inspector, "ix_extracted_records_doc_created", "extracted_records",
+        ["document_id", "created_at"],
+        postgresql_include=["extraction_status"]
+    )
+    _create_index_if_missing(
+        inspector, "ix_extracted_records_tpl_doc_created", "extracted_records",
+        ["field_template_id", "document_id", "created_at"]
+    )
+
+    # review_records
+    if "review_records" not in existing_tables:
+        op.create_table(
+            "review_records",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "extracted_record_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("extracted_records.id"),
+                nullable=False
+            ),
+            sa.Column("field_id", sa.String(100), nullable=False),
+            sa.Column("review_status", review_status, nullable=False),
+            sa.Column("manual_value", sa.Text(), nullable=True),
+            sa.Column("reviewer_notes", sa.Text(), nullable=True),
+            sa.Column("reviewed_by", sa.String(100), nullable=True),
+            sa.Column("reviewed_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_review_records_field_id", "review_records", ["field_id"])
+    else:
+        # Superseded by the unique (extracted_record_id, field_id) index
+        _drop_index_if_present(inspector, "ix_review_records_extracted_record_id", "review_records")
+
+        # Keep only the latest review per field before enforcing uniqueness;
+        # older ones are archived rather than dropped
+        op.execute(MIGRATION_ARCHIVE_TABLE)
+        op.execute(
+            f"""
+            WITH superseded AS (
+                DELETE FROM review_records older
+                USING review_records newer
+                WHERE older.extracted_record_id = newer.extracted_record_id
+                  AND older.field_id = newer.field_id
+                  AND (older.reviewed_at, older.id) < (newer.reviewed_at, newer.id)
+                RETURNING older.*
+            )
+            INSERT INTO migration_archive (revision, source_table, data)
+            SELECT '{revision}', 'review_records', to_jsonb(superseded) FROM superseded
+            """
+        )
+    _create_index_if_missing(
+        inspector, "ix_review_records_extracted_field", "review_records",
+        ["extracted_record_id", "field_id"],
+        unique=True,
+        postgresql_include=["review_status"]
+    )
+
+    # evaluation_results
+    if "evaluation_results" not in existing_tables:
+        op.create_table(
+            "evaluation_results",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column(
+                "project_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("projects.id"),
+                nullable=False
+            ),
+            sa.Column("evaluation_type", sa.String(50), nullable=False),
+            sa.Column("metrics", sa.JSON(), nullable=False),
+            sa.Column("human_labels_path", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_evaluation_results_project_id", "evaluation_results", ["project_id"])
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS migration_archive")
+    op.drop_table("evaluation_results")
+    op.drop_table("review_records")
+    op.drop_table("extracted_records")
+    op.drop_table("documents")
+    op.drop_table("projects")
+    op.drop_table("field_templates")
+
+    bind = op.get_bind()
+    for enum_type in (review_status, extraction_status, upload_status, project_status):
+        enum_type.drop(bind, checkfirst=True)
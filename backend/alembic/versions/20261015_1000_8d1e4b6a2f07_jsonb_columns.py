@@ -0,0 +1,61 @@
+"""Store JSON columns as JSONB and index extracted_fields
+
+Revision ID: 8d1e4b6a2f07
+Revises: 5c2f9e71a4d3
+Create Date: 2026-10-15 10:00:00.000000
+
+json columns are stored as text and re-parsed on every access; jsonb is
+stored pre-parsed and supports GIN-indexed containment (@>) queries.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1e4b6a2f07'
+down_revision: Union[str, None] = '5c2f9e71a4d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = [
+    ("field_templates", "fields", False),
+    ("documents", "file_metadata", True),
+    ("extracted_records", "extracted_fields", True),
+    ("evaluation_results", "metrics", False),
+]
+
+
+def upgrade() -> None:
+    for table, column, nullable in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=nullable,
+            postgresql_using=f"{column}::jsonb"
+        )
+
+    op.create_index(
+        "ix_extracted_records_fields_gin",
+        "extracted_records",
+        ["extracted_fields"],
+        postgresql_using="gin",
+        postgresql_ops={"extracted_fields": "jsonb_path_ops"}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_extracted_records_fields_gin", table_name="extracted_records")
+
+    for table, column, nullable in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=nullable,
+            postgresql_using=f"{column}::json"
+        )
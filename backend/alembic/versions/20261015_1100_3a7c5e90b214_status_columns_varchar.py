@@ -0,0 +1,63 @@
+"""Store status columns as VARCHAR with CHECK constraints
+
+Revision ID: 3a7c5e90b214
+Revises: 8d1e4b6a2f07
+Create Date: 2026-10-15 11:00:00.000000
+
+Replaces the native PostgreSQL ENUM types with VARCHAR(20) columns
+constrained by CHECK, matching Enum(..., native_enum=False) in the models.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c5e90b214'
+down_revision: Union[str, None] = '8d1e4b6a2f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, enum/constraint name, values)
+STATUS_COLUMNS = [
+    ("projects", "status", "projectstatus", ["ACTIVE", "ARCHIVED"]),
+    ("documents", "upload_status", "uploadstatus", ["UPLOADED", "PARSING", "PARSED", "FAILED"]),
+    ("extracted_records", "extraction_status", "extractionstatus",
+     ["PENDING", "IN_PROGRESS", "COMPLETED", "FAILED"]),
+    ("review_records", "review_status", "reviewstatus",
+     ["CONFIRMED", "REJECTED", "MANUAL_UPDATED", "MISSING_DATA", "PENDING"]),
+]
+
+
+def _check_sql(column: str, values: list) -> str:
+    return f"{column} IN ({', '.join(repr(value) for value in values)})"
+
+
+def upgrade() -> None:
+    for table, column, name, values in STATUS_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.String(20),
+            existing_type=sa.Enum(*values, name=name),
+            existing_nullable=False,
+            postgresql_using=f"{column}::text"
+        )
+        op.create_check_constraint(name, table, _check_sql(column, values))
+        op.execute(f"DROP TYPE IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table, column, name, values in STATUS_COLUMNS:
+        op.drop_constraint(name, table, type_="check")
+        enum_type = sa.Enum(*values, name=name)
+        enum_type.create(bind, checkfirst=True)
+        op.alter_column(
+            table, column,
+            type_=enum_type,
+            existing_type=sa.String(20),
+            existing_nullable=False,
+            postgresql_using=f"{column}::{name}"
+        )
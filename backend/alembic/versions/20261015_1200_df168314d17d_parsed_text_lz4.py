@@ -0,0 +1,37 @@
+"""Compress documents.parsed_text with LZ4
+
+Revision ID: df168314d17d
+Revises: 3a7c5e90b214
+Create Date: 2026-10-15 12:00:00.000000
+
+Parsed text of large documents is TOASTed; LZ4 compresses and
+decompresses it several times faster than the default pglz at a similar
+ratio. Only newly written values use it (existing rows are rewritten as
+documents are re-parsed).
+
+This only makes storing and reading the text cheaper for PostgreSQL; it
+does not change how much of it a worker holds in memory. Parsed text
+stays in this column rather than moving to object storage, because S3
+is optional in this deployment and the preview, upload dedup and every
+extraction read it from here. Extraction tasks instead avoid loading the
+text unless the document actually needs extracting (see
+PARSED_TEXT_SHA256 in app.workers.tasks).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'df168314d17d'
+down_revision: Union[str, None] = '3a7c5e90b214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE documents ALTER COLUMN parsed_text SET COMPRESSION lz4")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE documents ALTER COLUMN parsed_text SET COMPRESSION pglz")
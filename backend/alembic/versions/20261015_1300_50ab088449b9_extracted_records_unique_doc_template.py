@@ -0,0 +1,71 @@
+"""Unique extraction record per document and template
+
+Revision ID: 50ab088449b9
+Revises: df168314d17d
+Create Date: 2026-10-15 13:00:00.000000
+
+Extraction tasks upsert their record with INSERT ... ON CONFLICT, which
+needs a unique index on (document_id, field_template_id). Duplicates
+left by earlier get-or-create races are removed first, keeping the
+latest record per pair (the one the review table shows). The older,
+hidden records and their reviews are moved, as JSON, into
+migration_archive rather than deleted, so reviewer work on them can be
+recovered by hand.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '50ab088449b9'
+down_revision: Union[str, None] = 'df168314d17d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MIGRATION_ARCHIVE_TABLE = """
+    CREATE TABLE IF NOT EXISTS migration_archive (
+        id BIGSERIAL PRIMARY KEY,
+        revision VARCHAR(32) NOT NULL,
+        source_table VARCHAR(63) NOT NULL,
+        data JSONB NOT NULL,
+        archived_at TIMESTAMP NOT NULL DEFAULT now()
+    )
+"""
+
+SUPERSEDED_RECORDS = """
+    SELECT older.id
+    FROM extracted_records older
+    JOIN extracted_records newer
+      ON older.document_id = newer.document_id
+     AND older.field_template_id = newer.field_template_id
+     AND (older.created_at, older.id) < (newer.created_at, newer.id)
+"""
+
+
+def _archive(table: str, condition: str) -> None:
+    """Move rows matching condition from table into migration_archive"""
+    op.execute(
+        f"""
+        WITH moved AS (DELETE FROM {table} WHERE {condition} RETURNING *)
+        INSERT INTO migration_archive (revision, source_table, data)
+        SELECT '{revision}', '{table}', to_jsonb(moved) FROM moved
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute(MIGRATION_ARCHIVE_TABLE)
+    _archive("review_records", f"extracted_record_id IN ({SUPERSEDED_RECORDS})")
+    _archive("extracted_records", f"id IN ({SUPERSEDED_RECORDS})")
+    op.create_index(
+        "ix_extracted_records_doc_template",
+        "extracted_records",
+        ["document_id", "field_template_id"],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_extracted_records_doc_template", table_name="extracted_records")
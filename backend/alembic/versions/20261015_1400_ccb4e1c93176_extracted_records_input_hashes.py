@@ -0,0 +1,32 @@
+"""Record input hashes on extraction records
+
+Revision ID: ccb4e1c93176
+Revises: 50ab088449b9
+Create Date: 2026-10-15 14:00:00.000000
+
+Extraction tasks store SHA-256 digests of the parsed text and template
+fields they ran with, and skip the LLM when a completed record already
+matches both. Existing records have no digests and are re-extracted the
+next time they are queued.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ccb4e1c93176'
+down_revision: Union[str, None] = '50ab088449b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("extracted_records", sa.Column("text_sha256", sa.String(64), nullable=True))
+    op.add_column("extracted_records", sa.Column("template_sha256", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("extracted_records", "template_sha256")
+    op.drop_column("extracted_records", "text_sha256")
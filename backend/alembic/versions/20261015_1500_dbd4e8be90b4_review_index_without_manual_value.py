@@ -0,0 +1,41 @@
+"""Drop manual_value from the review records covering index
+
+Revision ID: dbd4e8be90b4
+Revises: ccb4e1c93176
+Create Date: 2026-10-15 15:00:00.000000
+
+Databases upgraded through an earlier baseline have
+ix_review_records_extracted_field with INCLUDE (review_status,
+manual_value). manual_value is unbounded TEXT, so a long manual
+correction exceeds the btree row size limit and the review upsert fails.
+The index is rebuilt including review_status only.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dbd4e8be90b4'
+down_revision: Union[str, None] = 'ccb4e1c93176'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_index(include: list) -> None:
+    op.drop_index("ix_review_records_extracted_field", table_name="review_records")
+    op.create_index(
+        "ix_review_records_extracted_field",
+        "review_records",
+        ["extracted_record_id", "field_id"],
+        unique=True,
+        postgresql_include=include
+    )
+
+
+def upgrade() -> None:
+    _recreate_index(["review_status"])
+
+
+def downgrade() -> None:
+    _recreate_index(["review_status", "manual_value"])
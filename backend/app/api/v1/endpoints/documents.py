@@ -2,26 +2,33 @@
 Document Endpoints
 Handles document upload, retrieval, and management
 """
-from typing import List
+from typing import BinaryIO, List, Set, Tuple
 from uuid import UUID
 from pathlib import Path
-import aiofiles
+import hashlib
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists, true
+from sqlalchemy.orm import load_only
+from uuid6 import uuid7
 import structlog
 
 from app.core.config import settings
 from app.db.session import get_db
-from app.models import Document, Project, UploadStatus, ProjectStatus
+from app.models import Document, ExtractedRecord, Project, UploadStatus, ProjectStatus
 from app.schemas import DocumentResponse, DocumentDetail, TaskStatusResponse
-from app.workers.tasks import parse_document_task
+from app.services import review_cache, storage
+from app.workers.tasks import parse_document_task, extract_document_task
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
+# Projects whose upload directory already exists in this process
+_dir_cache: Set[UUID] = set()
+
 
 # ============================================================================
 # Helper Functions
@@ -33,10 +40,10 @@ def validate_file_type(filename: str) -> str:
     
     Args:
         filename: Name of uploaded file
-        
+    
     Returns:
         str: File extension (e.g., '.pdf')
-        
+    
     Raises:
         HTTPException: If file type is not allowed
     """
@@ -51,48 +58,101 @@ def validate_file_type(filename: str) -> str:
     return file_ext
 
 
-async def save_upload_file(upload_file: UploadFile, file_path: Path) -> int:
+def _write_upload_sync(source: BinaryIO, file_path: Path, chunk_size: int) -> Tuple[int, str]:
+    """
+    Copy the spooled upload to disk in a single worker-thread pass
+    
+    The SHA-256 digest is computed on the same pass while each chunk is
+    still hot in cache.
+    
+    Args:
+        source: Spooled upload file object
+        file_path: Destination path
+        chunk_size: Bytes to read per iteration
+    
+    Returns:
+        Tuple of (file size in bytes, SHA-256 hex digest)
+    
+    Raises:
+        HTTPException: If file exceeds max size
+    """
+    file_size = 0
+    digest = hashlib.sha256()
+    
+    # Chunks are already large, so skip Python-level write buffering
+    with open(file_path, 'wb', buffering=0) as f:
+        while chunk := source.read(chunk_size):
+            file_size += len(chunk)
+            
+            # Check file size limit
+            if file_size > settings.MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds maximum size of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+                )
+            
+            f.write(chunk)
+            digest.update(chunk)
+    
+    return file_size, digest.hexdigest()
+
+
+async def save_upload_file(
+    upload_file: UploadFile,
+    file_path: Path,
+    project_id: UUID
+) -> Tuple[int, str]:
     """
     Save uploaded file to disk
     
+    The whole copy runs in one thread-pool dispatch instead of one
+    read hop and one write hop per chunk. The project directory is
+    only created on the first upload for that project in this process,
+    and recreated if it has since been removed.
+    
     Args:
         upload_file: FastAPI UploadFile object
         file_path: Destination path
-        
+        project_id: Project owning the upload directory
+    
     Returns:
-        int: File size in bytes
-        
+        Tuple of (file size in bytes, SHA-256 hex digest)
+    
     Raises:
         HTTPException: If file exceeds max size
     """
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    file_size = 0
-    chunk_size = 1024 * 1024  # 1MB chunks
+    if project_id not in _dir_cache:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        _dir_cache.add(project_id)
     
     try:
-        async with aiofiles.open(file_path, 'wb') as f:
-            while chunk := await upload_file.read(chunk_size):
-                file_size += len(chunk)
-                
-                # Check file size limit
-                if file_size > settings.MAX_UPLOAD_SIZE:
-                    # Delete partially written file
-                    file_path.unlink(missing_ok=True)
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"File exceeds maximum size of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
-                    )
-                
-                await f.write(chunk)
+        try:
+            file_size, file_sha256 = await run_in_threadpool(
+                _write_upload_sync,
+                upload_file.file,
+                file_path,
+                settings.UPLOAD_CHUNK_SIZE
+            )
+        except FileNotFoundError:
+            # Directory removed (cleanup, remounted volume) since it was
+            # cached; open() failed before anything was read, so retry once
+            _dir_cache.discard(project_id)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            _dir_cache.add(project_id)
+            file_size, file_sha256 = await run_in_threadpool(
+                _write_upload_sync,
+                upload_file.file,
+                file_path,
+                settings.UPLOAD_CHUNK_SIZE
+            )
     
     except Exception as e:
-        # Clean up on error
+        # Clean up on error (including partially written oversize files)
         file_path.unlink(missing_ok=True)
         logger.error("file_save_failed", filename=upload_file.filename, error=str(e))
         raise
     
-    return file_size
+    return file_size, file_sha256
 
 
 # ============================================================================
@@ -115,15 +175,22 @@ async def upload_document(
     
     Returns:
         DocumentResponse with upload status and metadata
-        
+    
     Process:
         1. Validate file type and size
-        2. Save file to disk
+        2. Save file to disk (or S3)
         3. Create database record
         4. Trigger async parsing task
     """
     logger.info("document_upload_started", project_id=str(project_id), filename=file.filename)
     
+    # Reject oversize uploads from the declared size before any copying
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds maximum size of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+        )
+    
     # Validate project exists and is active
     project_result = await db.execute(
         select(Project).where(
@@ -142,15 +209,28 @@ async def upload_document(
     # Validate file type
     file_ext = validate_file_type(file.filename)
     
-    # Generate unique file path
-    document_id = UUID(int=0)  # Temporary, will be replaced
-    file_path = Path(settings.UPLOAD_DIR) / str(project_id) / f"{document_id}_{file.filename}"
+    # Generate document ID up front so the file lands at its final path.
+    # Files are stored by ID only; the original name is kept on the record.
+    document_id = uuid7()
+    file_name = f"{document_id}{file_ext}"
     
-    # Save file
+    # Save file (streamed to S3 when configured, local disk otherwise)
     try:
-        file_size = await save_upload_file(file, file_path)
+        if storage.s3_enabled():
+            stored_path, file_size, file_sha256 = await storage.upload_to_s3(
+                file, f"{project_id}/{file_name}"
+            )
+        else:
+            file_path = Path(settings.UPLOAD_DIR) / str(project_id) / file_name
+            file_size, file_sha256 = await save_upload_file(file, file_path, project_id)
+            stored_path = str(file_path)
     except HTTPException:
         raise
+    except storage.FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error("unexpected_upload_error", filename=file.filename, error=str(e))
         raise HTTPException(
@@ -158,37 +238,60 @@ async def upload_document(
             detail="Failed to save uploaded file"
         )
     
+    # Look for an identical file already parsed in this project
+    duplicate_result = await db.execute(
+        select(Document)
+        .where(
+            Document.project_id == project_id,
+            Document.upload_status == UploadStatus.PARSED,
+            Document.file_metadata["sha256"].as_string() == file_sha256
+        )
+        .limit(1)
+    )
+    duplicate = duplicate_result.scalar_one_or_none()
+    
+    file_metadata = {
+        "original_filename": file.filename,
+        "content_type": file.content_type,
+        "sha256": file_sha256
+    }
+    
     # Create document record
     document = Document(
+        id=document_id,
         project_id=project_id,
         filename=file.filename,
         file_type=file_ext,
         file_size=file_size,
-        file_path=str(file_path),
+        file_path=stored_path,
         upload_status=UploadStatus.UPLOADED,
-        file_metadata={
-            "original_filename": file.filename,
-            "content_type": file.content_type
-        }
+        file_metadata=file_metadata
     )
     
-    db.add(document)
-    await db.commit()
-    await db.refresh(document)
+    if duplicate:
+        # Reuse the duplicate's parse output instead of parsing again
+        document.parsed_text = duplicate.parsed_text
+        document.file_metadata = {**(duplicate.file_metadata or {}), **file_metadata}
+        document.upload_status = UploadStatus.PARSED
     
-    # Update file path with actual document ID
-    new_file_path = Path(settings.UPLOAD_DIR) / str(project_id) / f"{document.id}_{file.filename}"
-    file_path.rename(new_file_path)
-    document.file_path = str(new_file_path)
+    db.add(document)
     await db.commit()
     await db.refresh(document)
+    await review_cache.invalidate(project_id)
     
-    logger.info("document_uploaded", document_id=str(document.id), file_size=file_size)
+    logger.info("document_uploaded",
+               document_id=str(document.id),
+               file_size=file_size,
+               duplicate_of=str(duplicate.id) if duplicate else None)
     
-    # Trigger async parsing task
+    # Trigger async parsing task (or extraction directly for duplicates)
     try:
-        task = parse_document_task.delay(str(document.id))
-        logger.info("parsing_task_queued", document_id=str(document.id), task_id=task.id)
+        if not duplicate:
+            task = parse_document_task.delay(str(document.id))
+            logger.info("parsing_task_queued", document_id=str(document.id), task_id=task.id)
+        elif project.field_template_id:
+            task = extract_document_task.delay(str(document.id), str(project.field_template_id))
+            logger.info("extraction_task_queued", document_id=str(document.id), task_id=task.id)
     except Exception as e:
         logger.error("task_queue_failed", document_id=str(document.id), error=str(e))
         # Don't fail the upload if task queueing fails
@@ -210,19 +313,21 @@ async def list_documents(
     - **skip**: Number of records to skip (pagination)
     - **limit**: Maximum number of records to return
     """
-    # Verify project exists
-    project_result = await db.execute(
-        select(Project).where(Project.id == project_id)
-    )
-    if not project_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Project with ID {project_id} not found"
-        )
-    
-    # Get documents
+    # Get documents, loading only the columns DocumentResponse serializes
+    # (parsed_text and file_metadata can be many KB per row)
     result = await db.execute(
         select(Document)
+        .options(load_only(
+            Document.id,
+            Document.project_id,
+            Document.filename,
+            Document.file_type,
+            Document.file_size,
+            Document.upload_status,
+            Document.error_message,
+            Document.created_at,
+            Document.updated_at
+        ))
         .where(Document.project_id == project_id)
         .order_by(Document.created_at.desc())
         .offset(skip)
@@ -230,6 +335,18 @@ async def list_documents(
     )
     
     documents = result.scalars().all()
+    
+    # Only an empty page needs a separate project existence check
+    if not documents:
+        project_exists = await db.scalar(
+            select(exists().where(Project.id == project_id))
+        )
+        if not project_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Project with ID {project_id} not found"
+            )
+    
     return documents
 
 
@@ -243,36 +360,38 @@ async def get_document(
     
     - **document_id**: UUID of the document
     """
+    # Latest extraction status joined onto the document in the same query
+    latest_extraction = (
+        select(ExtractedRecord.extraction_status)
+        .where(ExtractedRecord.document_id == Document.id)
+        .order_by(ExtractedRecord.created_at.desc())
+        .limit(1)
+        .lateral("latest_extraction")
+    )
+    
     result = await db.execute(
-        select(Document).where(Document.id == document_id)
+        select(Document, latest_extraction.c.extraction_status)
+        .outerjoin(latest_extraction, true())
+        .where(Document.id == document_id)
     )
-    document = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not document:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document with ID {document_id} not found"
         )
     
+    document, extraction_status = row
+    
     # Create response with preview
     response_data = {
         **{k: v for k, v in document.__dict__.items() if not k.startswith('_')},
         "parsed_text_preview": document.parsed_text[:500] if document.parsed_text else None,
-        "metadata": document.file_metadata
+        "metadata": document.file_metadata,
+        "extraction_status": extraction_status
     }
     
-    # Get extraction status if exists
-    from app.models import ExtractedRecord
-    extraction_result = await db.execute(
-        select(ExtractedRecord)
-        .where(ExtractedRecord.document_id == document_id)
-        .order_by(ExtractedRecord.created_at.desc())
-        .limit(1)
-    )
-    extraction = extraction_result.scalar_one_or_none()
-    if extraction:
-        response_data["extraction_status"] = extraction.extraction_status
-    
     return response_data
 
 
@@ -299,9 +418,11 @@ async def delete_document(
     
     # Delete physical file
     try:
-        file_path = Path(document.file_path)
-        file_path.unlink(missing_ok=True)
-        logger.info("file_deleted", document_id=str(document_id), file_path=str(file_path))
+        if storage.is_s3_uri(document.file_path):
+            await storage.delete_from_s3(document.file_path)
+        else:
+            Path(document.file_path).unlink(missing_ok=True)
+        logger.info("file_deleted", document_id=str(document_id), file_path=document.file_path)
     except Exception as e:
         logger.error("file_deletion_failed", document_id=str(document_id), error=str(e))
         # Continue with database deletion even if file deletion fails
@@ -309,6 +430,7 @@ async def delete_document(
     # Delete database record (cascades to extracted_records and review_records)
     await db.delete(document)
     await db.commit()
+    await review_cache.invalidate(document.project_id)
     
     logger.info("document_deleted", document_id=str(document_id))
     return None
@@ -335,16 +457,29 @@ async def download_document(
             detail=f"Document with ID {document_id} not found"
         )
     
+    # S3-backed files are served by the object store directly
+    if storage.is_s3_uri(document.file_path):
+        url = await storage.presigned_download_url(document.file_path, document.filename)
+        return RedirectResponse(url=url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    
     file_path = Path(document.file_path)
-    if not file_path.exists():
+    
+    # Single stat: doubles as the existence check and is handed to
+    # FileResponse so it does not stat the file again
+    try:
+        stat_result = file_path.stat()
+    except FileNotFoundError:
         logger.error("file_not_found", document_id=str(document_id), file_path=str(file_path))
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document file not found on disk"
         )
     
+    # Streamed straight from disk; keep compressing middleware off this route
+    # so servers supporting zero-copy sends can use them
     return FileResponse(
         path=str(file_path),
         filename=document.filename,
-        media_type="application/octet-stream"
+        media_type="application/octet-stream",
+        stat_result=stat_result
     )
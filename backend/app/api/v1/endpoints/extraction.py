@@ -5,9 +5,10 @@ Trigger and manage AI extraction tasks
 from typing import List
 from uuid import UUID
 
+from celery import group
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists
 import structlog
 
 from app.db.session import get_db
@@ -17,6 +18,7 @@ from app.schemas import (
     ExtractedRecordResponse,
     TaskStatusResponse
 )
+from app.workers.celery_app import celery_app
 from app.workers.tasks import extract_document_task
 
 logger = structlog.get_logger(__name__)
@@ -65,18 +67,17 @@ async def trigger_extraction(
     
     # Check if already extracted
     if not extraction_request.force_reprocess:
-        existing_result = await db.execute(
-            select(ExtractedRecord).where(
+        already_extracted = await db.scalar(
+            select(exists().where(
                 ExtractedRecord.document_id == document_id,
                 ExtractedRecord.field_template_id == extraction_request.field_template_id
-            )
+            ))
         )
-        existing = existing_result.scalar_one_or_none()
         
-        if existing:
+        if already_extracted:
             logger.info("extraction_already_exists", 
                        document_id=str(document_id),
-                       record_id=str(existing.id))
+                       template_id=str(extraction_request.field_template_id))
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Document already extracted. Use force_reprocess=true to re-extract."
@@ -86,7 +87,8 @@ async def trigger_extraction(
     try:
         task = extract_document_task.delay(
             str(document_id),
-            str(extraction_request.field_template_id)
+            str(extraction_request.field_template_id),
+            force=extraction_request.force_reprocess
         )
         
         logger.info("extraction_task_queued", 
@@ -144,46 +146,48 @@ async def trigger_project_extraction(
             detail="Project does not have a field template assigned"
         )
     
-    # Get all parsed documents
-    docs_result = await db.execute(
-        select(Document).where(
-            Document.project_id == project_id,
-            Document.upload_status == UploadStatus.PARSED
-        )
+    # Get parsed documents still needing extraction in a single query
+    docs_query = select(Document.id).where(
+        Document.project_id == project_id,
+        Document.upload_status == UploadStatus.PARSED
     )
-    documents = docs_result.scalars().all()
     
-    if not documents:
+    if not force_reprocess:
+        # Skip documents already extracted with this template
+        docs_query = docs_query.where(
+            Document.id.notin_(
+                select(ExtractedRecord.document_id).where(
+                    ExtractedRecord.field_template_id == project.field_template_id
+                )
+            )
+        )
+    
+    docs_result = await db.execute(docs_query)
+    document_ids = docs_result.scalars().all()
+    
+    if not document_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No parsed documents found in project"
+            detail="No parsed documents pending extraction in project"
         )
     
-    # Queue extraction tasks
-    queued_count = 0
-    for document in documents:
-        # Check if already extracted (if not forcing)
-        if not force_reprocess:
-            existing_result = await db.execute(
-                select(ExtractedRecord).where(
-                    ExtractedRecord.document_id == document.id,
-                    ExtractedRecord.field_template_id == project.field_template_id
-                )
-            )
-            if existing_result.scalar_one_or_none():
-                continue  # Skip already extracted
-        
-        try:
-            extract_document_task.delay(
-                str(document.id),
-                str(project.field_template_id)
-            )
-            queued_count += 1
-        except Exception as e:
-            logger.error("extraction_queue_failed",
-                        document_id=str(document.id),
-                        error=str(e))
-            continue
+    # Queue extraction tasks as one group published over a single pooled producer
+    template_id = str(project.field_template_id)
+    try:
+        with celery_app.producer_pool.acquire(block=True) as producer:
+            group(
+                extract_document_task.s(str(document_id), template_id, force=force_reprocess)
+                for document_id in document_ids
+            ).apply_async(producer=producer)
+        queued_count = len(document_ids)
+    except Exception as e:
+        logger.error("extraction_queue_failed",
+                    project_id=str(project_id),
+                    error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue extraction tasks"
+        )
     
     logger.info("project_extraction_queued",
                project_id=str(project_id),
@@ -209,16 +213,6 @@ async def get_document_extractions(
     
     - **document_id**: UUID of the document
     """
-    # Verify document exists
-    doc_result = await db.execute(
-        select(Document).where(Document.id == document_id)
-    )
-    if not doc_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found"
-        )
-    
     # Get extraction records
     result = await db.execute(
         select(ExtractedRecord)
@@ -227,6 +221,18 @@ async def get_document_extractions(
     )
     
     records = result.scalars().all()
+    
+    # Only an empty result needs a separate document existence check
+    if not records:
+        document_exists = await db.scalar(
+            select(exists().where(Document.id == document_id))
+        )
+        if not document_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document with ID {document_id} not found"
+            )
+    
     return records
 
 
@@ -5,20 +5,33 @@ Manages extraction schema templates
 from typing import List
 from uuid import UUID
 
+from celery import group
 from fastapi import APIRouter, HTTPException, Depends, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 import structlog
 
 from app.core.config import settings
 from app.db.session import get_db
-from app.models import FieldTemplate
-from app.schemas import FieldTemplateCreate, FieldTemplateUpdate, FieldTemplateResponse
+from app.models import FieldTemplate, Project, ProjectStatus
+from app.schemas import FieldDefinition, FieldTemplateCreate, FieldTemplateUpdate, FieldTemplateResponse
+from app.services import field_template_cache, review_cache
+from app.workers.celery_app import celery_app
 from app.workers.tasks import re_extract_project_task
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
+# Serializes a whole field list in one pydantic-core call
+_FIELDS_ADAPTER = TypeAdapter(List[FieldDefinition])
+
+
+# ============================================================================
+# Endpoints
+# ============================================================================
+
 
 @router.post("/", 
              response_model=FieldTemplateResponse,
@@ -47,12 +60,13 @@ async def create_field_template(
         )
     
     # Convert Pydantic models to dicts for JSON storage
-    fields_json = [f.model_dump() for f in template_data.fields]
+    fields_json = _FIELDS_ADAPTER.dump_python(template_data.fields, mode="json")
     
     template = FieldTemplate(
         name=template_data.name,
         version=1,
-        fields=fields_json
+        fields=fields_json,
+        fields_hash=field_template_cache.compute_fields_hash(fields_json)
     )
     
     db.add(template)
@@ -108,6 +122,8 @@ async def get_field_template(
             detail=f"Field template with ID {template_id} not found"
         )
     
+    field_template_cache.set_fields(template.id, template.version, template.fields)
+    
     return template
 
 
@@ -154,11 +170,16 @@ async def update_field_template(
             )
         
         # Convert to JSON
-        fields_json = [f.model_dump() for f in template_data.fields]
+        fields_json = _FIELDS_ADAPTER.dump_python(template_data.fields, mode="json")
         
-        # Check if fields actually changed
-        if fields_json != template.fields:
+        # Check if fields actually changed (compare digests, not JSON trees)
+        new_hash = field_template_cache.compute_fields_hash(fields_json)
+        current_hash = template.fields_hash or field_template_cache.compute_fields_hash(template.fields)
+        
+        if new_hash != current_hash:
+            field_template_cache.evict(template.id, template.version)
             template.fields = fields_json
+            template.fields_hash = new_hash
             template.version += 1
             fields_changed = True
             logger.info("template_fields_updated", 
@@ -170,11 +191,16 @@ async def update_field_template(
     
     logger.info("field_template_updated", template_id=str(template_id))
     
+    if fields_changed:
+        # Review table columns changed for every project using this template
+        project_ids_result = await db.execute(
+            select(Project.id).where(Project.field_template_id == template_id)
+        )
+        await review_cache.invalidate(*project_ids_result.scalars().all())
+    
     # Trigger re-extraction if requested and fields changed
     if trigger_re_extraction and fields_changed:
         # Get all projects using this template
-        from app.models import Project, ProjectStatus
-        
         projects_result = await db.execute(
             select(Project).where(
                 Project.field_template_id == template_id,
@@ -187,12 +213,16 @@ async def update_field_template(
                    template_id=str(template_id),
                    project_count=len(projects))
         
-        for project in projects:
+        if projects:
             try:
-                re_extract_project_task.delay(str(project.id))
+                with celery_app.producer_pool.acquire(block=True) as producer:
+                    group(
+                        re_extract_project_task.s(str(project.id))
+                        for project in projects
+                    ).apply_async(producer=producer)
             except Exception as e:
                 logger.error("re_extraction_queue_failed", 
-                           project_id=str(project.id),
+                           template_id=str(template_id),
                            error=str(e))
     
     return template
@@ -221,22 +251,17 @@ async def delete_field_template(
             detail=f"Field template with ID {template_id} not found"
         )
     
-    # Check if template is being used
-    from app.models import Project
-    
-    usage_result = await db.execute(
-        select(Project).where(Project.field_template_id == template_id).limit(1)
-    )
-    
-    if usage_result.scalar_one_or_none():
+    # Foreign keys reject the delete if the template is still referenced
+    try:
+        await db.delete(template)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot delete template that is being used by projects"
+            detail="Cannot delete template that is being used by projects or extractions"
         )
     
-    await db.delete(template)
-    await db.commit()
-    
     logger.info("field_template_deleted", template_id=str(template_id))
     return None
 
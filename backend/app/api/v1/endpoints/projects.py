@@ -7,8 +7,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import bindparam, func, lambda_stmt, select
 import structlog
 
 from app.db.session import get_db
@@ -19,10 +18,16 @@ from app.schemas import (
     ProjectResponse,
     ProjectDetail,
 )
+from app.services import review_cache
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
+# Single-project lookup; lambda_stmt caches the built statement as well as its SQL
+_project_by_id = lambda_stmt(
+    lambda: select(Project).where(Project.id == bindparam("project_id"))
+)
+
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
@@ -36,7 +41,7 @@ async def create_project(
     - **description**: Project description (optional)
     - **field_template_id**: Field template ID (optional)
     """
-    logger.info("creating_project", name=project_in.name)
+    logger.debug("creating_project", name=project_in.name)
     
     project = Project(
         name=project_in.name,
@@ -65,7 +70,7 @@ async def list_projects(
     - **skip**: Number of records to skip (default: 0)
     - **limit**: Max number of records to return (default: 50, max: 100)
     """
-    logger.info("listing_projects", skip=skip, limit=limit)
+    logger.debug("listing_projects", skip=skip, limit=limit)
     
     # Limit max page size
     limit = min(limit, 100)
@@ -89,13 +94,11 @@ async def get_project(
     """
     Get project by ID with detailed statistics
     """
-    logger.info("getting_project", project_id=str(project_id))
+    logger.debug("getting_project", project_id=str(project_id))
     
-    # Get project with relationships
+    # Get project
     result = await db.execute(
-        select(Project)
-        .options(selectinload(Project.documents))
-        .where(Project.id == project_id)
+        _project_by_id, {"project_id": project_id}
     )
     project = result.scalar_one_or_none()
     
@@ -105,34 +108,26 @@ async def get_project(
             detail=f"Project {project_id} not found"
         )
     
-    # Calculate statistics
-    doc_count = len(project.documents)
-    
-    # Count extracted documents
-    extracted_result = await db.execute(
-        select(func.count(ExtractedRecord.id.distinct()))
-        .join(Document)
-        .where(
-            Document.project_id == project_id,
-            ExtractedRecord.extraction_status == ExtractionStatus.COMPLETED
+    # Calculate all statistics in a single aggregate with FILTER clauses
+    stats_result = await db.execute(
+        select(
+            func.count(Document.id.distinct()).label("doc_count"),
+            func.count(ExtractedRecord.id.distinct()).filter(
+                ExtractedRecord.extraction_status == ExtractionStatus.COMPLETED
+            ).label("extracted_count"),
+            func.count(Document.id.distinct()).filter(
+                ExtractedRecord.id.is_(None) |
+                ExtractedRecord.extraction_status.in_([
+                    ExtractionStatus.PENDING,
+                    ExtractionStatus.IN_PROGRESS
+                ])
+            ).label("pending_count")
         )
-    )
-    extracted_count = extracted_result.scalar() or 0
-    
-    # Count pending documents
-    pending_result = await db.execute(
-        select(func.count(Document.id.distinct()))
+        .select_from(Document)
         .outerjoin(ExtractedRecord)
-        .where(
-            Document.project_id == project_id,
-            (ExtractedRecord.id.is_(None)) | 
-            (ExtractedRecord.extraction_status.in_([
-                ExtractionStatus.PENDING,
-                ExtractionStatus.IN_PROGRESS
-            ]))
-        )
+        .where(Document.project_id == project_id)
     )
-    pending_count = pending_result.scalar() or 0
+    doc_count, extracted_count, pending_count = stats_result.one()
     
     # Build response
     return ProjectDetail(
@@ -160,10 +155,10 @@ async def update_project(
     
     Note: Changing field_template_id will trigger re-extraction (handled by background task)
     """
-    logger.info("updating_project", project_id=str(project_id))
+    logger.debug("updating_project", project_id=str(project_id))
     
     result = await db.execute(
-        select(Project).where(Project.id == project_id)
+        _project_by_id, {"project_id": project_id}
     )
     project = result.scalar_one_or_none()
     
@@ -188,6 +183,7 @@ async def update_project(
     
     # TODO: Trigger re-extraction task if template changed
     if template_changed:
+        await review_cache.invalidate(project_id)
         logger.info("template_changed_reextraction_needed", project_id=str(project_id))
         # from app.workers.tasks import re_extract_project_task
         # re_extract_project_task.delay(str(project_id))
@@ -203,10 +199,10 @@ async def delete_project(
     """
     Delete project (soft delete - sets status to ARCHIVED)
     """
-    logger.info("deleting_project", project_id=str(project_id))
+    logger.debug("deleting_project", project_id=str(project_id))
     
     result = await db.execute(
-        select(Project).where(Project.id == project_id)
+        _project_by_id, {"project_id": project_id}
     )
     project = result.scalar_one_or_none()
     
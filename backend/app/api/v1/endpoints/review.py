@@ -2,29 +2,287 @@
 Review Endpoints
 Human review and manual editing of extracted data
 """
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import bindparam, exists, lambda_stmt, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
+import orjson
 import structlog
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
 from app.models import (
-    ReviewRecord, ExtractedRecord, Document, Project,
+    ReviewRecord, ExtractedRecord, Document, Project, FieldTemplate,
     ReviewStatus, ExtractionStatus
 )
 from app.schemas import (
     ReviewRecordCreate,
     ReviewRecordResponse,
-    ReviewTableResponse,
-    ReviewTableRow
+    ReviewTableResponse
 )
+from app.services import field_template_cache, review_cache
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
+# Project and template version for the review table; lambda_stmt caches the
+# built statement. Template fields come from field_template_cache.
+_project_with_template_version = lambda_stmt(
+    lambda: select(Project, FieldTemplate.version)
+    .outerjoin(FieldTemplate, FieldTemplate.id == Project.field_template_id)
+    .where(Project.id == bindparam("project_id"))
+)
+
+# Documents fetched per server-side cursor batch when streaming the review table
+REVIEW_TABLE_STREAM_BATCH = 100
+
+# Review status strings used per cell when building the review table
+PENDING_REVIEW = ReviewStatus.PENDING.value
+MISSING_DATA_REVIEW = ReviewStatus.MISSING_DATA.value
+
+
+# ============================================================================
+# Helper Functions
+# ============================================================================
+
+def review_values(review_data: ReviewRecordCreate) -> Dict[str, Any]:
+    """
+    Build ReviewRecord column values from a create request
+    
+    Args:
+        review_data: Review create request
+        
+    Returns:
+        Dict of column values for an upsert
+    """
+    return {
+        "extracted_record_id": review_data.extracted_record_id,
+        "field_id": review_data.field_id,
+        "review_status": review_data.review_status,
+        "manual_value": review_data.manual_value,
+        "reviewer_notes": review_data.reviewer_notes,
+        "reviewed_by": None,  # TODO: Add authentication and set user ID
+        "reviewed_at": datetime.utcnow()
+    }
+
+
+def upsert_reviews(values: List[Dict[str, Any]]):
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE for review records
+    
+    Existing reviews of the same (extracted_record_id, field_id) are
+    overwritten in place.
+    
+    Args:
+        values: Column values per review (see review_values)
+        
+    Returns:
+        PostgreSQL insert statement
+    """
+    stmt = pg_insert(ReviewRecord).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=[ReviewRecord.extracted_record_id, ReviewRecord.field_id],
+        set_={
+            "review_status": stmt.excluded.review_status,
+            "manual_value": stmt.excluded.manual_value,
+            "reviewer_notes": stmt.excluded.reviewer_notes,
+            "reviewed_at": stmt.excluded.reviewed_at,
+        }
+    )
+
+
+def review_table_query(project_id: UUID, field_template_id: UUID):
+    """
+    Build the review table query: each project document joined to its
+    latest extraction for the template (DISTINCT ON), in upload order
+    
+    Args:
+        project_id: UUID of the project
+        field_template_id: UUID of the project's field template
+        
+    Returns:
+        Select yielding (document_id, document_name, ExtractedRecord or None)
+    """
+    latest_extraction = aliased(
+        ExtractedRecord,
+        select(ExtractedRecord)
+        .where(ExtractedRecord.field_template_id == field_template_id)
+        .distinct(ExtractedRecord.document_id)
+        .order_by(ExtractedRecord.document_id, ExtractedRecord.created_at.desc())
+        .subquery("latest_extraction")
+    )
+    
+    return (
+        select(Document.id, Document.filename, latest_extraction)
+        .outerjoin(latest_extraction, latest_extraction.document_id == Document.id)
+        .where(Document.project_id == project_id)
+        .order_by(Document.created_at.asc())
+    )
+
+
+async def fetch_reviews(
+    db: AsyncSession,
+    extractions: List[Optional[ExtractedRecord]]
+) -> Dict[UUID, Dict[str, ReviewRecord]]:
+    """
+    Get review records for the completed extractions in one query
+    
+    Args:
+        db: Database session
+        extractions: Latest extraction per document (None if not extracted)
+        
+    Returns:
+        Dict of extraction ID -> field ID -> ReviewRecord
+    """
+    completed_ids = [
+        extraction.id for extraction in extractions
+        if extraction and extraction.extraction_status == ExtractionStatus.COMPLETED
+    ]
+    
+    reviews_by_extraction: Dict[UUID, Dict[str, ReviewRecord]] = {}
+    if completed_ids:
+        reviews_result = await db.execute(
+            select(ReviewRecord)
+            .where(ReviewRecord.extracted_record_id.in_(completed_ids))
+        )
+        for review in reviews_result.scalars():
+            reviews_by_extraction.setdefault(review.extracted_record_id, {})[review.field_id] = review
+    
+    return reviews_by_extraction
+
+
+def build_review_row(
+    document_id: UUID,
+    document_name: str,
+    extraction: Optional[ExtractedRecord],
+    reviews_by_extraction: Dict[UUID, Dict[str, ReviewRecord]],
+    template_fields: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Build one review table row
+    
+    Rows are plain dicts shaped like ReviewTableRow: the table is built
+    here, so a Pydantic validate + dump pass per row would only cost CPU.
+    
+    Args:
+        document_id: UUID of the document
+        document_name: Original filename
+        extraction: Latest extraction for the template, if any
+        reviews_by_extraction: Reviews from fetch_reviews
+        template_fields: Field definitions from the template
+        
+    Returns:
+        Row dict with per-field values, confidence, and review status
+    """
+    # Build field data
+    field_data = {}
+    
+    if extraction and extraction.extraction_status == ExtractionStatus.COMPLETED:
+        # Review records for this extraction
+        reviews = reviews_by_extraction.get(extraction.id, {})
+        
+        # Index extracted values once instead of scanning per field
+        extracted_by_id = {
+            f['field_id']: f for f in (extraction.extracted_fields or [])
+        }
+        
+        # Process each field
+        for field_def in template_fields:
+            field_id = field_def['field_id']
+            
+            # Find extracted value
+            extracted_field = extracted_by_id.get(field_id)
+            
+            # Get review if exists
+            review = reviews.get(field_id)
+            
+            # Build field data
+            if extracted_field:
+                field_data[field_id] = {
+                    "field_name": field_def['field_name'],
+                    "extracted_value": extracted_field.get('raw_value'),
+                    "normalized_value": extracted_field.get('normalized_value'),
+                    "confidence_score": extracted_field.get('confidence_score', 0.0),
+                    "review_status": review.review_status.value if review else PENDING_REVIEW,
+                    "manual_value": review.manual_value if review else None,
+                    "final_value": review.manual_value if review and review.manual_value else extracted_field.get('normalized_value'),
+                    "citations": extracted_field.get('citations', [])
+                }
+            else:
+                # Field not found in extraction
+                field_data[field_id] = {
+                    "field_name": field_def['field_name'],
+                    "extracted_value": None,
+                    "normalized_value": None,
+                    "confidence_score": 0.0,
+                    "review_status": MISSING_DATA_REVIEW,
+                    "manual_value": review.manual_value if review else None,
+                    "final_value": review.manual_value if review else None,
+                    "citations": []
+                }
+    else:
+        # No extraction or failed extraction
+        for field_def in template_fields:
+            field_data[field_def['field_id']] = {
+                "field_name": field_def['field_name'],
+                "extracted_value": None,
+                "normalized_value": None,
+                "confidence_score": 0.0,
+                "review_status": "NOT_EXTRACTED",
+                "manual_value": None,
+                "final_value": None,
+                "citations": []
+            }
+    
+    return {
+        "document_id": document_id,
+        "document_name": document_name,
+        "fields": field_data
+    }
+
+
+async def stream_review_table(
+    project_id: UUID,
+    field_template_id: UUID,
+    columns: List[str],
+    template_fields: List[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Yield the review table as NDJSON: a columns line, then one line per document
+    
+    Documents are read through a server-side cursor in batches of
+    REVIEW_TABLE_STREAM_BATCH, with one reviews query per batch. The
+    request's session is closed before a streamed body is sent, so the
+    stream opens its own.
+    """
+    yield orjson.dumps({"columns": columns}) + b"\n"
+    
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            review_table_query(project_id, field_template_id)
+            .execution_options(yield_per=REVIEW_TABLE_STREAM_BATCH)
+        )
+        async for partition in result.partitions():
+            reviews_by_extraction = await fetch_reviews(
+                session, [extraction for _, _, extraction in partition]
+            )
+            for document_id, document_name, extraction in partition:
+                row = build_review_row(
+                    document_id, document_name, extraction,
+                    reviews_by_extraction, template_fields
+                )
+                yield orjson.dumps(row) + b"\n"
+
+
+# ============================================================================
+# Endpoints
+# ============================================================================
+
 
 @router.post("/reviews",
              response_model=ReviewRecordResponse,
@@ -42,29 +300,32 @@ async def create_review_record(
     - **manual_value**: Manual correction (optional)
     - **reviewer_notes**: Additional notes (optional)
     """
-    logger.info("creating_review_record",
-               extracted_record_id=str(review_data.extracted_record_id),
-               field_id=review_data.field_id)
+    logger.debug("creating_review_record",
+                extracted_record_id=str(review_data.extracted_record_id),
+                field_id=review_data.field_id)
     
-    # Verify extracted record exists
+    # Verify extracted record exists, loading only the columns needed to
+    # validate the field and invalidate the project's review table
     extracted_result = await db.execute(
-        select(ExtractedRecord).where(
-            ExtractedRecord.id == review_data.extracted_record_id
-        )
+        select(ExtractedRecord.extracted_fields, Document.project_id)
+        .join(Document, Document.id == ExtractedRecord.document_id)
+        .where(ExtractedRecord.id == review_data.extracted_record_id)
     )
-    extracted_record = extracted_result.scalar_one_or_none()
+    extracted_row = extracted_result.one_or_none()
     
-    if not extracted_record:
+    if not extracted_row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Extracted record with ID {review_data.extracted_record_id} not found"
         )
     
+    extracted_fields, project_id = extracted_row
+    
     # Verify field exists in extracted data
-    if extracted_record.extracted_fields:
+    if extracted_fields:
         field_exists = any(
             f.get('field_id') == review_data.field_id 
-            for f in extracted_record.extracted_fields
+            for f in extracted_fields
         )
         if not field_exists:
             raise HTTPException(
@@ -72,47 +333,17 @@ async def create_review_record(
                 detail=f"Field '{review_data.field_id}' not found in extracted record"
             )
     
-    # Check if review already exists
-    existing_result = await db.execute(
-        select(ReviewRecord).where(
-            and_(
-                ReviewRecord.extracted_record_id == review_data.extracted_record_id,
-                ReviewRecord.field_id == review_data.field_id
-            )
-        )
+    # Insert or update the review in one statement
+    result = await db.scalars(
+        upsert_reviews([review_values(review_data)]).returning(ReviewRecord),
+        execution_options={"populate_existing": True}
     )
-    existing_review = existing_result.scalar_one_or_none()
-    
-    if existing_review:
-        # Update existing review
-        existing_review.review_status = review_data.review_status
-        existing_review.manual_value = review_data.manual_value
-        existing_review.reviewer_notes = review_data.reviewer_notes
-        # reviewed_at will auto-update via onupdate
-        
-        await db.commit()
-        await db.refresh(existing_review)
-        
-        logger.info("review_record_updated", review_id=str(existing_review.id))
-        return existing_review
+    review = result.one()
+    await db.commit()
+    await review_cache.invalidate(project_id)
     
-    else:
-        # Create new review
-        review = ReviewRecord(
-            extracted_record_id=review_data.extracted_record_id,
-            field_id=review_data.field_id,
-            review_status=review_data.review_status,
-            manual_value=review_data.manual_value,
-            reviewer_notes=review_data.reviewer_notes,
-            reviewed_by=None  # TODO: Add authentication and set user ID
-        )
-        
-        db.add(review)
-        await db.commit()
-        await db.refresh(review)
-        
-        logger.info("review_record_created", review_id=str(review.id))
-        return review
+    logger.info("review_record_saved", review_id=str(review.id))
+    return review
 
 
 @router.get("/extractions/{extracted_record_id}/reviews",
@@ -126,16 +357,6 @@ async def get_extraction_reviews(
     
     - **extracted_record_id**: UUID of the extracted record
     """
-    # Verify extracted record exists
-    extracted_result = await db.execute(
-        select(ExtractedRecord).where(ExtractedRecord.id == extracted_record_id)
-    )
-    if not extracted_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Extracted record with ID {extracted_record_id} not found"
-        )
-    
     # Get reviews
     result = await db.execute(
         select(ReviewRecord)
@@ -144,6 +365,18 @@ async def get_extraction_reviews(
     )
     
     reviews = result.scalars().all()
+    
+    # Only an empty result needs a separate existence check
+    if not reviews:
+        record_exists = await db.scalar(
+            select(exists().where(ExtractedRecord.id == extracted_record_id))
+        )
+        if not record_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Extracted record with ID {extracted_record_id} not found"
+            )
+    
     return reviews
 
 
@@ -151,6 +384,7 @@ async def get_extraction_reviews(
             response_model=ReviewTableResponse)
 async def get_project_review_table(
     project_id: UUID,
+    response_format: Literal["json", "ndjson"] = Query("json", alias="format"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -160,141 +394,98 @@ async def get_project_review_table(
     - Columns: Field names from template
     - Rows: Each document with extracted values, confidence, and review status
     
-    This is the main endpoint for the review UI.
+    This is the main endpoint for the review UI. JSON responses are cached
+    in Redis until a write bumps the project's review table version.
+    With **format=ndjson** the table is streamed instead: a
+    `{"columns": [...]}` line followed by one line per row.
     """
-    logger.info("fetching_review_table", project_id=str(project_id))
+    logger.debug("fetching_review_table", project_id=str(project_id))
     
-    # Get project with field template
+    if response_format == "json":
+        cached_table, cache_key = await review_cache.get_table(project_id)
+        if cached_table is not None:
+            return Response(content=cached_table, media_type="application/json")
+    
+    # Get project with its field template version
     project_result = await db.execute(
-        select(Project).where(Project.id == project_id)
+        _project_with_template_version, {"project_id": project_id}
     )
-    project = project_result.scalar_one_or_none()
+    project_row = project_result.one_or_none()
     
-    if not project:
+    if not project_row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with ID {project_id} not found"
         )
     
+    project, template_version = project_row
+    
     if not project.field_template_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project does not have a field template"
         )
     
-    # Get field template
-    template = project.field_template
-    if not template:
+    if template_version is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Field template not found"
         )
     
+    # Get field definitions (templates are immutable per version)
+    template_fields = field_template_cache.get_fields(project.field_template_id, template_version)
+    if template_fields is None:
+        # Read version alongside fields so a concurrent edit is cached correctly
+        template_result = await db.execute(
+            select(FieldTemplate.version, FieldTemplate.fields)
+            .where(FieldTemplate.id == project.field_template_id)
+        )
+        version, template_fields = template_result.one()
+        field_template_cache.set_fields(project.field_template_id, version, template_fields)
+    
     # Extract column names
-    columns = [field['field_name'] for field in template.fields]
+    columns = [field['field_name'] for field in template_fields]
     
-    # Get all documents with their extractions
+    if response_format == "ndjson":
+        return StreamingResponse(
+            stream_review_table(project_id, project.field_template_id, columns, template_fields),
+            media_type="application/x-ndjson"
+        )
+    
+    # Get all documents joined to their latest extraction in one query
     docs_result = await db.execute(
-        select(Document)
-        .where(Document.project_id == project_id)
-        .order_by(Document.created_at.asc())
+        review_table_query(project_id, project.field_template_id)
     )
-    documents = docs_result.scalars().all()
-    
-    rows = []
-    
-    for document in documents:
-        # Get latest extraction for this document
-        extraction_result = await db.execute(
-            select(ExtractedRecord)
-            .where(
-                and_(
-                    ExtractedRecord.document_id == document.id,
-                    ExtractedRecord.field_template_id == project.field_template_id
-                )
-            )
-            .order_by(ExtractedRecord.created_at.desc())
-            .limit(1)
-        )
-        extraction = extraction_result.scalar_one_or_none()
-        
-        # Build field data
-        field_data = {}
-        
-        if extraction and extraction.extraction_status == ExtractionStatus.COMPLETED:
-            # Get review records for this extraction
-            reviews_result = await db.execute(
-                select(ReviewRecord)
-                .where(ReviewRecord.extracted_record_id == extraction.id)
-            )
-            reviews = {r.field_id: r for r in reviews_result.scalars().all()}
-            
-            # Process each field
-            for field_def in template.fields:
-                field_id = field_def['field_id']
-                
-                # Find extracted value
-                extracted_field = next(
-                    (f for f in extraction.extracted_fields if f['field_id'] == field_id),
-                    None
-                )
-                
-                # Get review if exists
-                review = reviews.get(field_id)
-                
-                # Build field data
-                if extracted_field:
-                    field_data[field_id] = {
-                        "field_name": field_def['field_name'],
-                        "extracted_value": extracted_field.get('raw_value'),
-                        "normalized_value": extracted_field.get('normalized_value'),
-                        "confidence_score": extracted_field.get('confidence_score', 0.0),
-                        "review_status": review.review_status.value if review else ReviewStatus.PENDING.value,
-                        "manual_value": review.manual_value if review else None,
-                        "final_value": review.manual_value if review and review.manual_value else extracted_field.get('normalized_value'),
-                        "citations": extracted_field.get('citations', [])
-                    }
-                else:
-                    # Field not found in extraction
-                    field_data[field_id] = {
-                        "field_name": field_def['field_name'],
-                        "extracted_value": None,
-                        "normalized_value": None,
-                        "confidence_score": 0.0,
-                        "review_status": ReviewStatus.MISSING_DATA.value,
-                        "manual_value": review.manual_value if review else None,
-                        "final_value": review.manual_value if review else None,
-                        "citations": []
-                    }
-        else:
-            # No extraction or failed extraction
-            for field_def in template.fields:
-                field_data[field_def['field_id']] = {
-                    "field_name": field_def['field_name'],
-                    "extracted_value": None,
-                    "normalized_value": None,
-                    "confidence_score": 0.0,
-                    "review_status": "NOT_EXTRACTED",
-                    "manual_value": None,
-                    "final_value": None,
-                    "citations": []
-                }
-        
-        rows.append(ReviewTableRow(
-            document_id=document.id,
-            document_name=document.filename,
-            fields=field_data
-        ))
-    
-    logger.info("review_table_fetched",
-               project_id=str(project_id),
-               document_count=len(rows),
-               field_count=len(columns))
-    
-    return ReviewTableResponse(
-        columns=columns,
-        rows=rows
+    documents = docs_result.all()
+    
+    # Get review records for all completed extractions in one query
+    reviews_by_extraction = await fetch_reviews(
+        db, [extraction for _, _, extraction in documents]
     )
+    
+    rows = [
+        build_review_row(
+            document_id, document_name, extraction,
+            reviews_by_extraction, template_fields
+        )
+        for document_id, document_name, extraction in documents
+    ]
+    
+    logger.debug("review_table_fetched",
+                project_id=str(project_id),
+                document_count=len(rows),
+                field_count=len(columns))
+    
+    # Serialized once with orjson; response_model only documents the shape
+    payload = orjson.dumps({
+        "columns": columns,
+        "rows": rows
+    })
+    
+    if cache_key:
+        await review_cache.set_table(cache_key, payload)
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/reviews/bulk",
@@ -309,56 +500,50 @@ async def bulk_create_reviews(
     
     Useful for batch operations in the review UI.
     """
-    logger.info("bulk_review_creation", count=len(reviews_data))
+    logger.debug("bulk_review_creation", count=len(reviews_data))
+    
+    # Resolve extracted records and their projects in one query
+    records_result = await db.execute(
+        select(ExtractedRecord.id, Document.project_id)
+        .join(Document, Document.id == ExtractedRecord.document_id)
+        .where(ExtractedRecord.id.in_({r.extracted_record_id for r in reviews_data}))
+    )
+    project_by_record = dict(records_result.all())
     
-    created_count = 0
-    updated_count = 0
     errors = []
+    values_by_key = {}
     
     for review_data in reviews_data:
-        try:
-            # Check if exists
-            existing_result = await db.execute(
-                select(ReviewRecord).where(
-                    and_(
-                        ReviewRecord.extracted_record_id == review_data.extracted_record_id,
-                        ReviewRecord.field_id == review_data.field_id
-                    )
-                )
-            )
-            existing = existing_result.scalar_one_or_none()
-            
-            if existing:
-                # Update
-                existing.review_status = review_data.review_status
-                existing.manual_value = review_data.manual_value
-                existing.reviewer_notes = review_data.reviewer_notes
-                updated_count += 1
-            else:
-                # Create
-                review = ReviewRecord(
-                    extracted_record_id=review_data.extracted_record_id,
-                    field_id=review_data.field_id,
-                    review_status=review_data.review_status,
-                    manual_value=review_data.manual_value,
-                    reviewer_notes=review_data.reviewer_notes
-                )
-                db.add(review)
-                created_count += 1
-        
-        except Exception as e:
-            logger.error("bulk_review_error",
-                        extracted_record_id=str(review_data.extracted_record_id),
-                        field_id=review_data.field_id,
-                        error=str(e))
+        if review_data.extracted_record_id not in project_by_record:
             errors.append({
                 "extracted_record_id": str(review_data.extracted_record_id),
                 "field_id": review_data.field_id,
-                "error": str(e)
+                "error": "Extracted record not found"
             })
             continue
+        
+        # Last entry wins when a batch repeats a field (a single upsert
+        # cannot touch the same row twice)
+        key = (review_data.extracted_record_id, review_data.field_id)
+        values_by_key[key] = review_values(review_data)
     
-    await db.commit()
+    created_count = 0
+    updated_count = 0
+    
+    if values_by_key:
+        # xmax is 0 only for rows inserted (not updated) by this statement
+        result = await db.execute(
+            upsert_reviews(list(values_by_key.values()))
+            .returning(literal_column("xmax = 0"))
+        )
+        inserted = result.scalars().all()
+        created_count = sum(inserted)
+        updated_count = len(inserted) - created_count
+        
+        await db.commit()
+        await review_cache.invalidate(*{
+            project_by_record[record_id] for record_id, _ in values_by_key
+        })
     
     logger.info("bulk_review_completed",
                created=created_count,
@@ -2,7 +2,8 @@
 Application Configuration
 Environment variables and settings management
 """
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 
@@ -17,15 +18,28 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     LOG_LEVEL: str = "INFO"
     SECRET_KEY: str = "change-me-in-production"
+    WORKERS: int = 1  # Uvicorn worker processes (ignored with reload)
     
     # Database
+    # Connection budget: WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW) for the API
+    # plus one or two per Celery worker process must stay below the server's
+    # max_connections (100 by default; leave a few for migrations and psql).
+    # The defaults give 4 x 15 = 60 for the API image.
     DATABASE_URL: str
     DATABASE_URL_SYNC: str
+    DB_POOL_SIZE: int = 10  # Per API worker process
+    DB_MAX_OVERFLOW: int = 5  # Per API worker process
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Reconnect before NAT/idle timeouts drop connections
+    DB_POOL_WARM_SIZE: int = 5  # Connections opened at startup
+    DB_USE_NULL_POOL: bool = False  # Set when PgBouncer (transaction pooling) does the pooling
     
     # Redis & Celery
     REDIS_URL: str
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
+    CELERY_BROKER_POOL_LIMIT: int = 50
+    CELERY_WORKER_CONCURRENCY: int = 0  # Prefork parse/extract processes; 0 = one per CPU
     
     # AI/LLM
     GEMINI_API_KEY: str
@@ -34,8 +48,15 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "/data/uploads"
     MAX_UPLOAD_SIZE: int = 52428800  # 50MB
+    UPLOAD_CHUNK_SIZE: int = 8388608  # 8MB
     ALLOWED_FILE_TYPES: List[str] = [".pdf", ".docx", ".html", ".txt"]
     
+    # Object Storage (uploads go to S3 instead of UPLOAD_DIR when bucket is set)
+    S3_BUCKET: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_ENDPOINT_URL: str = ""  # e.g. MinIO
+    S3_PRESIGNED_URL_TTL: int = 3600  # 1 hour
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3004",
@@ -49,15 +70,29 @@ class Settings(BaseSettings):
     # Extraction
     EXTRACTION_TIMEOUT: int = 300  # 5 minutes
     MAX_RETRIES: int = 3
+    EXTRACTION_CHUNK_SIZE: int = 50000  # Document characters per LLM call
+    EXTRACTION_MAX_PARALLEL: int = 5  # Concurrent LLM calls per document
+    EXTRACTION_FIELDS_PER_CALL: int = 10  # Fields per LLM call; larger templates are split
+    EXTRACTION_BATCH_SIZE: int = 5  # Documents per task when re-extracting a project
+    EXTRACTION_RETRY_BACKOFF_MAX: int = 600  # Cap on the delay between extraction retries (seconds)
     
     # LLM Settings
     LLM_TEMPERATURE: float = 0.1
     LLM_MAX_TOKENS: int = 8192
+    LLM_CACHE_ENABLED: bool = True  # Reuse responses for identical prompts
+    LLM_CACHE_TTL_DAYS: int = 30
+    # Separate Redis for cached responses, with its own memory limit and an
+    # LRU eviction policy; the broker Redis (REDIS_URL) must not evict keys.
+    # Falls back to REDIS_URL, where writes fail (and are skipped) once full.
+    LLM_CACHE_REDIS_URL: Optional[str] = None
+    GEMINI_RPM: int = 60  # Requests per minute across all workers; 0 = unlimited
+    GEMINI_TPM: int = 1000000  # Prompt tokens per minute across all workers; 0 = unlimited
     
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
-        extra="ignore"
+        extra="ignore",
+        frozen=True
     )
     
     @field_validator("ALLOWED_ORIGINS", mode="before")
@@ -69,5 +104,16 @@ class Settings(BaseSettings):
         return v
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings
+    
+    Environment parsing and validation run once per process; the
+    frozen instance is safe to share and to use as a FastAPI dependency.
+    """
+    return Settings()
+
+
 # Create global settings instance
-settings = Settings()
+settings = get_settings()
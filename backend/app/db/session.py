@@ -4,19 +4,46 @@ Async SQLAlchemy setup with connection pooling
 """
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import create_engine
-from typing import AsyncGenerator
+from sqlalchemy.pool import NullPool
+from sqlalchemy import create_engine, text
+from typing import Any, AsyncGenerator
+import asyncio
+
+import orjson
 
 from app.core.config import settings
 
+# Pool settings (PgBouncer in transaction mode pools for us instead)
+if settings.DB_USE_NULL_POOL:
+    pool_kwargs = {"poolclass": NullPool}
+else:
+    pool_kwargs = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def json_serializer(value: Any) -> str:
+    """Encode JSON/JSONB column values with orjson"""
+    return orjson.dumps(value).decode()
+
+
+# JSON/JSONB columns are (de)serialized with orjson instead of stdlib json
+json_kwargs = {
+    "json_serializer": json_serializer,
+    "json_deserializer": orjson.loads,
+}
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    pool_size=10,
-    max_overflow=20,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    query_cache_size=1200,  # Room for every endpoint's compiled statements
+    **json_kwargs,
+    **pool_kwargs,
 )
 
 # Create sync engine for Alembic migrations
@@ -24,6 +51,7 @@ sync_engine = create_engine(
     settings.DATABASE_URL_SYNC,
     echo=settings.DEBUG,
     pool_pre_ping=True,
+    **json_kwargs,
 )
 
 # Create async session factory
@@ -59,10 +87,18 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def create_tables():
+async def warm_pool():
     """
-    Create all database tables
-    Called during application startup
+    Open DB_POOL_WARM_SIZE connections concurrently at startup
+    so the first requests don't pay for connection setup
     """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if settings.DB_USE_NULL_POOL:
+        return
+    
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    await asyncio.gather(*(
+        _ping() for _ in range(min(settings.DB_POOL_WARM_SIZE, settings.DB_POOL_SIZE))
+    ))
@@ -4,15 +4,21 @@ Main FastAPI application entry point
 """
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
+import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import structlog
 
 from app.api.v1.router import api_router
 from app.core.config import settings
-from app.db.session import engine, create_tables
+from app.db.session import engine, warm_pool
+
+# Apply LOG_LEVEL to stdlib loggers; filter_by_level below then drops
+# disabled events before any other processor runs
+logging.basicConfig(format="%(message)s", level=settings.LOG_LEVEL.upper())
 
 # Configure structured logging
 structlog.configure(
@@ -35,6 +41,21 @@ structlog.configure(
 logger = structlog.get_logger(__name__)
 
 
+class APIGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that leaves document downloads alone
+    
+    Uploaded PDFs/DOCX are already compressed, and wrapping a FileResponse
+    would turn a sendfile into a read-compress-write loop.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/download"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
     """
@@ -44,9 +65,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Startup
     logger.info("application_startup", environment=settings.ENVIRONMENT)
     
-    # Create database tables
-    await create_tables()
-    logger.info("database_tables_created")
+    # Schema is managed by Alembic (`alembic upgrade head` runs at deploy time)
+    
+    # Pre-open pooled connections
+    await warm_pool()
+    logger.info("database_pool_warmed")
     
     yield
     
@@ -64,6 +87,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -71,10 +95,14 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# Compress JSON responses (review tables are large and highly compressible)
+app.add_middleware(APIGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Health check endpoint
 @app.get("/health", tags=["Health"])
@@ -82,7 +110,7 @@ async def health_check():
     """
     Health check endpoint for monitoring
     """
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "status": "healthy",
             "environment": settings.ENVIRONMENT,
@@ -123,7 +151,7 @@ async def global_exception_handler(request, exc):
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
@@ -139,6 +167,9 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
         reload=settings.DEBUG,
+        workers=None if settings.DEBUG else settings.WORKERS,
         log_level=settings.LOG_LEVEL.lower()
     )
@@ -4,14 +4,14 @@ SQLAlchemy ORM models for all entities
 """
 from datetime import datetime
 from typing import Optional
-from uuid import uuid4
 
 from sqlalchemy import (
     Column, String, Text, Integer, Float, Boolean, DateTime,
-    ForeignKey, Enum, JSON, BigInteger
+    ForeignKey, Enum, BigInteger, Index
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
+from uuid6 import uuid7
 import enum
 
 from app.db.session import Base
@@ -53,25 +53,33 @@ class FieldType(str, enum.Enum):
     LIST = "LIST"
 
 
+# Status columns are VARCHAR + CHECK rather than native PostgreSQL ENUM types,
+# so adding a value is a constraint swap instead of ALTER TYPE
+STATUS_ENUM_KWARGS = {"native_enum": False, "create_constraint": True, "length": 20}
+
+
 # Models
+# Primary keys are UUIDv7: time-ordered, so inserts append to the right
+# edge of each PK index instead of landing on random leaf pages
 class Project(Base):
     """
     Project model - Container for documents and field templates
     """
     __tablename__ = "projects"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    field_template_id = Column(UUID(as_uuid=True), ForeignKey("field_templates.id"), nullable=True)
-    status = Column(Enum(ProjectStatus), default=ProjectStatus.ACTIVE, nullable=False)
+    field_template_id = Column(UUID(as_uuid=True), ForeignKey("field_templates.id", ondelete="RESTRICT"), nullable=True)
+    status = Column(Enum(ProjectStatus, **STATUS_ENUM_KWARGS), default=ProjectStatus.ACTIVE, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    field_template = relationship("FieldTemplate", back_populates="projects")
-    documents = relationship("Document", back_populates="project", cascade="all, delete-orphan")
-    evaluation_results = relationship("EvaluationResult", back_populates="project", cascade="all, delete-orphan")
+    # lazy="raise": load related rows explicitly in the query, never per attribute access
+    field_template = relationship("FieldTemplate", back_populates="projects", lazy="raise")
+    documents = relationship("Document", back_populates="project", lazy="raise", cascade="all, delete-orphan")
+    evaluation_results = relationship("EvaluationResult", back_populates="project", lazy="raise", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Project {self.name}>"
@@ -83,16 +91,18 @@ class FieldTemplate(Base):
     """
     __tablename__ = "field_templates"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(255), nullable=False, index=True)
     version = Column(Integer, default=1, nullable=False)
-    fields = Column(JSON, nullable=False)  # Array of field definitions
+    fields = Column(JSONB, nullable=False)  # Array of field definitions
+    fields_hash = Column(String(64), nullable=True)  # SHA-256 of canonical fields JSON
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    projects = relationship("Project", back_populates="field_template")
-    extracted_records = relationship("ExtractedRecord", back_populates="field_template")
+    # passive_deletes="all": leave child rows alone so the FK rejects deleting an in-use template
+    projects = relationship("Project", back_populates="field_template", lazy="raise", passive_deletes="all")
+    extracted_records = relationship("ExtractedRecord", back_populates="field_template", lazy="raise", passive_deletes="all")
     
     def __repr__(self):
         return f"<FieldTemplate {self.name} v{self.version}>"
@@ -103,23 +113,27 @@ class Document(Base):
     Document model - Uploaded legal documents
     """
     __tablename__ = "documents"
+    __table_args__ = (
+        # Serves project listings ordered by upload time (scanned backwards for DESC)
+        Index("ix_documents_project_created", "project_id", "created_at"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
     filename = Column(String(500), nullable=False)
     file_type = Column(String(50), nullable=False)
     file_size = Column(BigInteger, nullable=False)
     file_path = Column(Text, nullable=False)
-    upload_status = Column(Enum(UploadStatus), default=UploadStatus.UPLOADED, nullable=False)
+    upload_status = Column(Enum(UploadStatus, **STATUS_ENUM_KWARGS), default=UploadStatus.UPLOADED, nullable=False)
     parsed_text = Column(Text, nullable=True)
-    file_metadata = Column(JSON, nullable=True)  # Renamed from 'metadata' to avoid SQLAlchemy conflict
+    file_metadata = Column(JSONB, nullable=True)  # Renamed from 'metadata' to avoid SQLAlchemy conflict
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    project = relationship("Project", back_populates="documents")
-    extracted_records = relationship("ExtractedRecord", back_populates="document", cascade="all, delete-orphan")
+    project = relationship("Project", back_populates="documents", lazy="raise")
+    extracted_records = relationship("ExtractedRecord", back_populates="document", lazy="raise", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Document {self.filename}>"
@@ -130,20 +144,49 @@ class ExtractedRecord(Base):
     Extracted Record model - AI extraction results
     """
     __tablename__ = "extracted_records"
-    
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
+    __table_args__ = (
+        # Serves "latest extraction for a document" lookups without a sort;
+        # the included status makes get_document's lookup index-only
+        Index(
+            "ix_extracted_records_doc_created",
+            "document_id", "created_at",
+            postgresql_include=["extraction_status"]
+        ),
+        # One record per (document, template); extraction tasks upsert against it
+        Index(
+            "ix_extracted_records_doc_template",
+            "document_id", "field_template_id",
+            unique=True
+        ),
+        # Serves "latest extraction per document for a template" (DISTINCT ON) scans
+        Index(
+            "ix_extracted_records_tpl_doc_created",
+            "field_template_id", "document_id", "created_at"
+        ),
+        # Serves containment filters such as extracted_fields @> '[{"field_id": "x"}]'
+        Index(
+            "ix_extracted_records_fields_gin",
+            "extracted_fields",
+            postgresql_using="gin",
+            postgresql_ops={"extracted_fields": "jsonb_path_ops"}
+        ),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False)
     field_template_id = Column(UUID(as_uuid=True), ForeignKey("field_templates.id"), nullable=False)
-    extraction_status = Column(Enum(ExtractionStatus), default=ExtractionStatus.PENDING, nullable=False)
-    extracted_fields = Column(JSON, nullable=True)  # Array of field results
+    extraction_status = Column(Enum(ExtractionStatus, **STATUS_ENUM_KWARGS), default=ExtractionStatus.PENDING, nullable=False)
+    extracted_fields = Column(JSONB, nullable=True)  # Array of field results
+    text_sha256 = Column(String(64), nullable=True)  # SHA-256 of the parsed text extracted from
+    template_sha256 = Column(String(64), nullable=True)  # fields_hash of the template fields used
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    document = relationship("Document", back_populates="extracted_records")
-    field_template = relationship("FieldTemplate", back_populates="extracted_records")
-    review_records = relationship("ReviewRecord", back_populates="extracted_record", cascade="all, delete-orphan")
+    document = relationship("Document", back_populates="extracted_records", lazy="raise")
+    field_template = relationship("FieldTemplate", back_populates="extracted_records", lazy="raise")
+    review_records = relationship("ReviewRecord", back_populates="extracted_record", lazy="raise", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<ExtractedRecord {self.id}>"
@@ -154,18 +197,29 @@ class ReviewRecord(Base):
     Review Record model - Manual review and edits
     """
     __tablename__ = "review_records"
-    
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    extracted_record_id = Column(UUID(as_uuid=True), ForeignKey("extracted_records.id"), nullable=False, index=True)
+    __table_args__ = (
+        # One review per field of an extraction; also the upsert conflict target
+        Index(
+            "ix_review_records_extracted_field",
+            "extracted_record_id", "field_id",
+            unique=True,
+            # manual_value is unbounded TEXT; keeping it out of the index
+            # avoids btree row-size errors on long corrections
+            postgresql_include=["review_status"]
+        ),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    extracted_record_id = Column(UUID(as_uuid=True), ForeignKey("extracted_records.id"), nullable=False)
     field_id = Column(String(100), nullable=False, index=True)
-    review_status = Column(Enum(ReviewStatus), nullable=False)
+    review_status = Column(Enum(ReviewStatus, **STATUS_ENUM_KWARGS), nullable=False)
     manual_value = Column(Text, nullable=True)
     reviewer_notes = Column(Text, nullable=True)
     reviewed_by = Column(String(100), nullable=True)  # User ID (future)
     reviewed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    extracted_record = relationship("ExtractedRecord", back_populates="review_records")
+    extracted_record = relationship("ExtractedRecord", back_populates="review_records", lazy="raise")
     
     def __repr__(self):
         return f"<ReviewRecord {self.field_id}: {self.review_status}>"
@@ -177,15 +231,15 @@ class EvaluationResult(Base):
     """
     __tablename__ = "evaluation_results"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False, index=True)
     evaluation_type = Column(String(50), nullable=False)
-    metrics = Column(JSON, nullable=False)  # Accuracy, coverage, per-field scores
+    metrics = Column(JSONB, nullable=False)  # Accuracy, coverage, per-field scores
     human_labels_path = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    project = relationship("Project", back_populates="evaluation_results")
+    project = relationship("Project", back_populates="evaluation_results", lazy="raise")
     
     def __repr__(self):
         return f"<EvaluationResult {self.evaluation_type}>"
@@ -1,11 +1,18 @@
 """
 Pydantic Schemas
 Request/Response models for API validation
+
+Request bodies, ORM-backed responses and responses with constrained
+fields are Pydantic models. Unconstrained responses built by the API
+from already-trusted values are plain slotted dataclasses: FastAPI still
+derives their OpenAPI schema, but they skip per-instance validation when
+constructed.
 """
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models import ProjectStatus, UploadStatus, ExtractionStatus, ReviewStatus, FieldType
 
@@ -39,8 +46,7 @@ class ProjectResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class ProjectDetail(ProjectResponse):
@@ -68,7 +74,7 @@ class FieldDefinition(BaseModel):
 class FieldTemplateCreate(BaseModel):
     """Schema for creating field template"""
     name: str = Field(..., min_length=1, max_length=255)
-    fields: List[FieldDefinition] = Field(..., min_items=1, description="Field definitions")
+    fields: List[FieldDefinition] = Field(..., min_length=1, description="Field definitions")
 
 
 class FieldTemplateUpdate(BaseModel):
@@ -86,8 +92,7 @@ class FieldTemplateResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # ============================================================================
@@ -106,8 +111,7 @@ class DocumentResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class DocumentDetail(DocumentResponse):
@@ -153,8 +157,7 @@ class ExtractedRecordResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # ============================================================================
@@ -181,18 +184,19 @@ class ReviewRecordResponse(BaseModel):
     reviewed_by: Optional[str]
     reviewed_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
-class ReviewTableRow(BaseModel):
+@dataclass(slots=True)
+class ReviewTableRow:
     """Schema for review table row"""
     document_id: UUID
     document_name: str
     fields: Dict[str, Any]  # field_id -> field data with value, confidence, status
 
 
-class ReviewTableResponse(BaseModel):
+@dataclass(slots=True)
+class ReviewTableResponse:
     """Schema for review table response"""
     columns: List[str]  # Field names for table headers
     rows: List[ReviewTableRow]
@@ -230,8 +234,7 @@ class EvaluationResultResponse(BaseModel):
     metrics: EvaluationMetrics
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # ============================================================================
@@ -252,13 +255,15 @@ class TaskStatusResponse(BaseModel):
 # Generic Response Schemas
 # ============================================================================
 
-class ErrorResponse(BaseModel):
+@dataclass(slots=True)
+class ErrorResponse:
     """Schema for error responses"""
     detail: str
     error: Optional[str] = None
 
 
-class SuccessResponse(BaseModel):
+@dataclass(slots=True)
+class SuccessResponse:
     """Schema for generic success responses"""
     message: str
     data: Optional[Any] = None
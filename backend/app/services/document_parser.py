@@ -2,11 +2,19 @@
 Document Parser Service
 Extracts text content from various document formats (PDF, DOCX, HTML, TXT)
 """
+from collections import Counter
+import io
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import ClassVar, Dict, Any, Optional
 import structlog
 
-# PDF parsing
+# PDF parsing (pypdfium2 preferred, pypdf as pure-Python fallback)
+try:
+    import pypdfium2 as pdfium
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
 try:
     import pypdf
     HAS_PYPDF = True
@@ -27,6 +35,13 @@ try:
 except ImportError:
     HAS_BS4 = False
 
+# Text encoding detection
+try:
+    import charset_normalizer
+    HAS_CHARSET_NORMALIZER = True
+except ImportError:
+    HAS_CHARSET_NORMALIZER = False
+
 
 logger = structlog.get_logger(__name__)
 
@@ -47,14 +62,15 @@ class DocumentParser:
         - Plain text (.txt)
     """
     
-    def __init__(self):
-        self.parsers = {
-            '.pdf': self._parse_pdf,
-            '.docx': self._parse_docx,
-            '.html': self._parse_html,
-            '.htm': self._parse_html,
-            '.txt': self._parse_txt,
-        }
+    # File extension -> parser method name; the parser holds no state, so one
+    # shared instance (document_parser below) serves every task
+    PARSERS: ClassVar[Dict[str, str]] = {
+        '.pdf': '_parse_pdf',
+        '.docx': '_parse_docx',
+        '.html': '_parse_html',
+        '.htm': '_parse_html',
+        '.txt': '_parse_txt',
+    }
     
     def parse(self, file_path: str) -> Dict[str, Any]:
         """
@@ -62,33 +78,37 @@ class DocumentParser:
         
         Args:
             file_path: Path to the document file
-            
+        
         Returns:
             Dict containing:
                 - text: Extracted text content
                 - metadata: Additional parsing metadata
-                
+        
         Raises:
             DocumentParserError: If parsing fails
         """
         path = Path(file_path)
         
-        if not path.exists():
+        # One stat serves both the existence check and the size metadata
+        try:
+            file_size = path.stat().st_size
+        except FileNotFoundError:
             raise DocumentParserError(f"File not found: {file_path}")
         
         file_ext = path.suffix.lower()
         
-        if file_ext not in self.parsers:
+        parser_name = self.PARSERS.get(file_ext)
+        if parser_name is None:
             raise DocumentParserError(f"Unsupported file type: {file_ext}")
         
         logger.info("parsing_document", file_path=str(path), file_type=file_ext)
         
         try:
-            parser_func = self.parsers[file_ext]
+            parser_func = getattr(self, parser_name)
             result = parser_func(path)
             
             # Add common metadata
-            result['metadata']['file_size'] = path.stat().st_size
+            result['metadata']['file_size'] = file_size
             result['metadata']['file_type'] = file_ext
             
             # Calculate text statistics
@@ -109,21 +129,112 @@ class DocumentParser:
             logger.error("parsing_failed", file_path=str(path), error=str(e), exc_info=True)
             raise DocumentParserError(f"Failed to parse document: {str(e)}") from e
     
+    @staticmethod
+    def _write_page(buf: io.StringIO, page_num: int, page_text: str) -> None:
+        """
+        Append a page to the text buffer behind a [PAGE n] marker
+        
+        Args:
+            buf: Buffer collecting the document text
+            page_num: 1-based page number
+            page_text: Extracted text of the page
+        """
+        # Page markers are used for citation tracking
+        if buf.tell():
+            buf.write('\n')
+        buf.write('\n[PAGE ')
+        buf.write(str(page_num))
+        buf.write(']\n')
+        buf.write(page_text)
+    
     def _parse_pdf(self, path: Path) -> Dict[str, Any]:
         """
-        Parse PDF document using pypdf
+        Parse PDF document with pypdfium2, falling back to pypdf
         
         Args:
             path: Path to PDF file
-            
+        
         Returns:
             Dict with text and metadata
         """
+        if HAS_PDFIUM:
+            return self._parse_pdf_pdfium(path)
+        
         if not HAS_PYPDF:
-            raise DocumentParserError("pypdf library not installed. Cannot parse PDF files.")
+            raise DocumentParserError("pypdfium2 or pypdf library required. Cannot parse PDF files.")
+        
+        return self._parse_pdf_pypdf(path)
+    
+    def _parse_pdf_pdfium(self, path: Path) -> Dict[str, Any]:
+        """
+        Parse PDF document using pypdfium2 (PDFium C library)
+        
+        Args:
+            path: Path to PDF file
+        
+        Returns:
+            Dict with text and metadata
+        """
+        try:
+            buf = io.StringIO()
+            metadata = {}
+            
+            pdf = pdfium.PdfDocument(str(path))
+            try:
+                # Extract metadata
+                pdf_metadata = pdf.get_metadata_dict(skip_empty=True)
+                if pdf_metadata:
+                    metadata['pdf_metadata'] = {
+                        'author': pdf_metadata.get('Author'),
+                        'creator': pdf_metadata.get('Creator'),
+                        'producer': pdf_metadata.get('Producer'),
+                        'subject': pdf_metadata.get('Subject'),
+                        'title': pdf_metadata.get('Title'),
+                    }
+                
+                metadata['page_count'] = len(pdf)
+                
+                # Extract text from all pages
+                for page_num, page in enumerate(pdf, start=1):
+                    try:
+                        textpage = page.get_textpage()
+                        page_text = textpage.get_text_range()
+                        textpage.close()
+                        if page_text and page_text.strip():
+                            self._write_page(buf, page_num, page_text)
+                    except Exception as e:
+                        logger.warning("page_extraction_failed", 
+                                     page_num=page_num, 
+                                     error=str(e))
+                        continue
+                    finally:
+                        page.close()
+            finally:
+                pdf.close()
+            
+            text = buf.getvalue().strip()
+            
+            if not text:
+                raise DocumentParserError("No text content extracted from PDF")
+            
+            return {'text': text, 'metadata': metadata}
+        
+        except pdfium.PdfiumError as e:
+            raise DocumentParserError(f"Invalid or corrupted PDF file: {str(e)}") from e
+    
+    def _parse_pdf_pypdf(self, path: Path) -> Dict[str, Any]:
+        """
+        Parse PDF document using pypdf
         
+        Args:
+            path: Path to PDF file
+        
+        Returns:
+            Dict with text and metadata
+        """
         try:
-            text_parts = []
+            # Write pages into one buffer rather than joining per-page strings
+            buf = io.StringIO()
             metadata = {}
             
             with open(path, 'rb') as file:
@@ -146,15 +257,14 @@ class DocumentParser:
                     try:
                         page_text = page.extract_text()
                         if page_text and page_text.strip():
-                            # Add page marker for citation tracking
-                            text_parts.append(f"\n[PAGE {page_num}]\n{page_text}")
+                            self._write_page(buf, page_num, page_text)
                     except Exception as e:
                         logger.warning("page_extraction_failed", 
                                      page_num=page_num, 
                                      error=str(e))
                         continue
             
-            text = "\n".join(text_parts).strip()
+            text = buf.getvalue().strip()
             
             if not text:
                 raise DocumentParserError("No text content extracted from PDF")
@@ -170,7 +280,7 @@ class DocumentParser:
         
         Args:
             path: Path to DOCX file
-            
+        
         Returns:
             Dict with text and metadata
         """
@@ -180,27 +290,34 @@ class DocumentParser:
         try:
             doc = DocxDocument(path)
             
+            # Write paragraphs, then table rows, into one buffer
+            buf = io.StringIO()
+            paragraph_count = 0
+            
             # Extract paragraphs
-            paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
+            for para in doc.paragraphs:
+                para_text = para.text
+                if para_text and not para_text.isspace():
+                    buf.write(para_text)
+                    buf.write('\n')
+                    paragraph_count += 1
             
             # Extract tables
-            table_texts = []
             for table in doc.tables:
                 for row in table.rows:
                     row_text = ' | '.join(cell.text.strip() for cell in row.cells)
-                    if row_text.strip():
-                        table_texts.append(row_text)
+                    if row_text and not row_text.isspace():
+                        buf.write(row_text)
+                        buf.write('\n')
             
-            # Combine all text
-            all_text = paragraphs + table_texts
-            text = "\n".join(all_text).strip()
+            text = buf.getvalue().strip()
             
             if not text:
                 raise DocumentParserError("No text content extracted from DOCX")
             
             # Metadata
             metadata = {
-                'paragraph_count': len(paragraphs),
+                'paragraph_count': paragraph_count,
                 'table_count': len(doc.tables),
             }
             
@@ -225,7 +342,7 @@ class DocumentParser:
         
         Args:
             path: Path to HTML file
-            
+        
         Returns:
             Dict with text and metadata
         """
@@ -236,7 +353,7 @@ class DocumentParser:
             with open(path, 'r', encoding='utf-8', errors='ignore') as file:
                 html_content = file.read()
             
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, 'lxml')
             
             # Remove script and style elements
             for script in soup(['script', 'style', 'meta', 'link']):
@@ -256,12 +373,13 @@ class DocumentParser:
             if title_tag:
                 metadata['title'] = title_tag.get_text(strip=True)
             
-            # Count structural elements
+            # Count structural elements in a single tree walk
+            tag_counts = Counter(tag.name for tag in soup.find_all(True))
             metadata['html_structure'] = {
-                'headings': len(soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])),
-                'paragraphs': len(soup.find_all('p')),
-                'tables': len(soup.find_all('table')),
-                'lists': len(soup.find_all(['ul', 'ol'])),
+                'headings': sum(tag_counts[h] for h in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')),
+                'paragraphs': tag_counts['p'],
+                'tables': tag_counts['table'],
+                'lists': tag_counts['ul'] + tag_counts['ol'],
             }
             
             return {'text': text, 'metadata': metadata}
@@ -275,27 +393,26 @@ class DocumentParser:
         
         Args:
             path: Path to text file
-            
+        
         Returns:
             Dict with text and metadata
         """
         try:
-            # Try UTF-8 first, fallback to latin-1
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            text = None
-            encoding_used = None
-            
-            for encoding in encodings:
-                try:
-                    with open(path, 'r', encoding=encoding) as file:
-                        text = file.read()
-                    encoding_used = encoding
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if text is None:
-                raise DocumentParserError("Failed to decode text file with any supported encoding")
+            # Read once; decode as UTF-8, otherwise detect the encoding
+            data = path.read_bytes()
+            
+            try:
+                text = data.decode('utf-8')
+                encoding_used = 'utf-8'
+            except UnicodeDecodeError:
+                best_match = charset_normalizer.from_bytes(data).best() if HAS_CHARSET_NORMALIZER else None
+                if best_match is not None:
+                    text = str(best_match)
+                    encoding_used = best_match.encoding
+                else:
+                    # latin-1 maps every byte, so this cannot fail
+                    text = data.decode('latin-1')
+                    encoding_used = 'latin-1'
             
             text = text.strip()
             
@@ -304,10 +421,14 @@ class DocumentParser:
             
             metadata = {
                 'encoding': encoding_used,
-                'line_count': len(text.split('\n')),
+                'line_count': text.count('\n') + 1,
             }
             
             return {'text': text, 'metadata': metadata}
         
         except Exception as e:
             raise DocumentParserError(f"Failed to parse text file: {str(e)}") from e
+
+
+# Shared parser instance
+document_parser = DocumentParser()
@@ -2,40 +2,136 @@
 Gemini AI Extraction Service
 Uses Google Gemini LLM to extract structured data from documents
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Awaitable, Optional, Tuple, TypeVar
 from uuid import UUID
-import json
+import asyncio
+import os
 import re
+import orjson
 import structlog
 
 try:
+    from langchain_core.messages import AIMessage, HumanMessage
     from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain.prompts import ChatPromptTemplate
-    from langchain.output_parsers import PydanticOutputParser
-    from pydantic import BaseModel, Field, create_model
     HAS_LANGCHAIN = True
 except ImportError:
     HAS_LANGCHAIN = False
 
 from app.core.config import settings
 from app.models import FieldType
+from app.services import llm_cache, rate_limiter
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
+LLM_MODEL = "gemini-1.5-flash"
+
+# Follow-up calls asking the model to fix a response that failed to parse
+PARSE_RETRY_ATTEMPTS = 2
+
+# Patterns used per LLM response / per field value, compiled once
+FENCED_JSON_ARRAY_RE = re.compile(r'```(?:json)?\s*(\[.*?\])\s*```', re.DOTALL)
+DATE_PATTERNS = (
+    re.compile(r'(\d{4})-(\d{2})-(\d{2})'),  # 2024-01-15
+    re.compile(r'(\d{2})/(\d{2})/(\d{4})'),  # 01/15/2024
+    re.compile(r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})', re.IGNORECASE),  # 15 January 2024
+)
+NUMBER_RE = re.compile(r'-?[\d,]+\.?\d*')
+LIST_SEPARATOR_RE = re.compile(r'[,;]')
+BOOLEAN_TRUE_VALUES = frozenset({'yes', 'true', '1', 'y', 't'})
+BOOLEAN_FALSE_VALUES = frozenset({'no', 'false', '0', 'n', 'f'})
+
+# Preferred chunk boundaries, best first
+CHUNK_SEPARATORS = ('\n\n', '. ', '\n')
+# Characters shared by consecutive chunks (at most a quarter of a chunk)
+CHUNK_OVERLAP = 150
+
+
+def _find_json_array(text: str) -> Optional[str]:
+    """
+    Return the first balanced JSON array in text, if any
+    
+    Single left-to-right pass tracking bracket depth and string literals,
+    so brackets inside values don't end the array early and malformed
+    output can't trigger regex backtracking.
+    
+    Args:
+        text: Raw LLM response
+    
+    Returns:
+        The array text, or None if no '[' is closed
+    """
+    start = text.find('[')
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get this process's long-lived event loop, creating it on first use
+    
+    The gRPC aio client behind ChatGoogleGenerativeAI is process-global and
+    bound to the loop it is first used on, so every extraction in a worker
+    process has to run on the same loop. asyncio.run closes its loop after
+    one call, which breaks the second extraction ("Event loop is closed").
+    A forked child gets a fresh loop rather than its parent's.
+    """
+    global _loop, _loop_pid
+    
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion on this process's event loop
+    
+    Use instead of asyncio.run from synchronous code (Celery tasks).
+    
+    Args:
+        coro: Coroutine to run
+    
+    Returns:
+        The coroutine's result
+    """
+    return get_loop().run_until_complete(coro)
+
 
 class ExtractionError(Exception):
     """Custom exception for extraction errors"""
     pass
 
 
-class FieldExtraction(BaseModel):
-    """Model for a single extracted field"""
-    field_id: str = Field(description="Field identifier")
-    raw_value: Optional[str] = Field(None, description="Extracted raw value")
-    confidence_score: float = Field(0.0, ge=0.0, le=1.0, description="Confidence score 0-1")
-    citations: List[Dict[str, str]] = Field(default_factory=list, description="Source citations")
-
-
 class GeminiExtractor:
     """
     Extract structured data from documents using Google Gemini
@@ -55,7 +151,7 @@ class GeminiExtractor:
             raise ExtractionError("GEMINI_API_KEY not configured")
         
         self.llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash",
+            model=LLM_MODEL,
             google_api_key=settings.GEMINI_API_KEY,
             temperature=settings.LLM_TEMPERATURE,
             max_output_tokens=settings.LLM_MAX_TOKENS,
@@ -65,7 +161,33 @@ class GeminiExtractor:
         self,
         document_text: str,
         field_definitions: List[Dict[str, Any]],
-        chunk_size: int = 50000
+        chunk_size: Optional[int] = None,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract fields from document text (blocking wrapper around aextract)
+        
+        Args:
+            document_text: Full text content of document
+            field_definitions: List of field definitions from template
+            chunk_size: Maximum characters per chunk (default EXTRACTION_CHUNK_SIZE)
+            use_cache: Reuse cached LLM responses; False always calls the LLM
+                (responses are still cached)
+        
+        Returns:
+            List of extracted field dictionaries
+        
+        Raises:
+            ExtractionError: If extraction fails
+        """
+        return run_sync(self.aextract(document_text, field_definitions, chunk_size, use_cache))
+    
+    async def aextract(
+        self,
+        document_text: str,
+        field_definitions: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Extract fields from document text
@@ -73,68 +195,195 @@ class GeminiExtractor:
         Args:
             document_text: Full text content of document
             field_definitions: List of field definitions from template
-            chunk_size: Maximum characters per chunk for processing
-            
+            chunk_size: Maximum characters per chunk (default EXTRACTION_CHUNK_SIZE)
+            use_cache: Reuse cached LLM responses; False always calls the LLM
+                (responses are still cached)
+        
         Returns:
             List of extracted field dictionaries
-            
+        
         Raises:
             ExtractionError: If extraction fails
         """
+        if chunk_size is None:
+            chunk_size = settings.EXTRACTION_CHUNK_SIZE
+        
         logger.info("extraction_started", 
                    text_length=len(document_text),
                    field_count=len(field_definitions))
         
         try:
+            # Fields are extracted in groups; each group's prompt parts are
+            # built once and reused for every chunk
+            field_groups = [
+                (group, self._build_prompt_template(group))
+                for group in self._group_fields(field_definitions)
+            ]
+            
+            # Caps the LLM requests in flight across chunks and groups
+            semaphore = asyncio.Semaphore(settings.EXTRACTION_MAX_PARALLEL)
+            
             # For very large documents, process in chunks
             if len(document_text) > chunk_size:
                 logger.info("document_chunking_required", 
                            text_length=len(document_text),
                            chunk_size=chunk_size)
-                return self._extract_chunked(document_text, field_definitions, chunk_size)
+                return await self._extract_chunked(
+                    document_text, field_definitions, field_groups, semaphore, chunk_size, use_cache
+                )
             
             # Single extraction for smaller documents
-            return self._extract_single(document_text, field_definitions)
+            return await self._extract_single(document_text, field_groups, semaphore, use_cache)
         
         except Exception as e:
             logger.error("extraction_failed", error=str(e), exc_info=True)
             raise ExtractionError(f"Extraction failed: {str(e)}") from e
     
-    def _extract_single(
+    def _group_fields(
         self,
-        document_text: str,
         field_definitions: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Split field definitions into groups extracted by separate LLM calls
+        
+        Args:
+            field_definitions: Field definitions in template order
+        
+        Returns:
+            Groups of at most EXTRACTION_FIELDS_PER_CALL fields
+        """
+        group_size = settings.EXTRACTION_FIELDS_PER_CALL
+        return [
+            field_definitions[i:i + group_size]
+            for i in range(0, len(field_definitions), group_size)
+        ]
+    
+    async def _extract_single(
+        self,
+        document_text: str,
+        field_groups: List[Tuple[List[Dict[str, Any]], Tuple[str, str]]],
+        semaphore: asyncio.Semaphore,
+        use_cache: bool
     ) -> List[Dict[str, Any]]:
         """
-        Extract all fields in a single LLM call
+        Extract all fields from one piece of text, one LLM call per field group
         
         Args:
             document_text: Document text
-            field_definitions: Field definitions
-            
+            field_groups: (field definitions, prompt parts) per group
+            semaphore: Limits concurrent LLM calls
+            use_cache: Reuse cached LLM responses
+        
+        Returns:
+            List of extracted fields
+        """
+        results = await asyncio.gather(*(
+            self._extract_group(document_text, group, prompt_template, semaphore, use_cache)
+            for group, prompt_template in field_groups
+        ))
+        
+        return [field for group_fields in results for field in group_fields]
+    
+    async def _extract_group(
+        self,
+        document_text: str,
+        field_definitions: List[Dict[str, Any]],
+        prompt_template: Tuple[str, str],
+        semaphore: asyncio.Semaphore,
+        use_cache: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract one group of fields in a single LLM call
+        
+        Args:
+            document_text: Document text
+            field_definitions: Field definitions in this group
+            prompt_template: Prompt parts for this group
+            semaphore: Limits concurrent LLM calls
+            use_cache: Reuse a cached response for the same prompt
+        
         Returns:
             List of extracted fields
         """
         # Build extraction prompt
-        prompt = self._build_extraction_prompt(document_text, field_definitions)
+        prompt = self._build_extraction_prompt(document_text, prompt_template)
         
-        logger.info("llm_invocation", prompt_length=len(prompt))
+        # Identical prompts reuse the cached response instead of calling the
+        # LLM; forced runs skip the lookup but still refresh the entry
+        cache_key = None
+        response_text = None
+        if settings.LLM_CACHE_ENABLED:
+            cache_key = llm_cache.make_key(LLM_MODEL, settings.LLM_TEMPERATURE, prompt)
+            if use_cache:
+                response_text = await llm_cache.get(cache_key)
         
-        # Invoke LLM
-        response = self.llm.invoke(prompt)
+        if response_text is not None:
+            logger.info("llm_cache_hit", prompt_length=len(prompt))
+            return self._parse_response(response_text, field_definitions)
         
-        # Parse response
-        extracted_fields = self._parse_response(response.content, field_definitions)
+        logger.info("llm_invocation", prompt_length=len(prompt))
+        response_text = await self._invoke_llm(prompt, semaphore)
+        
+        # Parse response; on malformed output, show the model its error and
+        # ask for a corrected answer instead of failing the whole extraction
+        for attempt in range(PARSE_RETRY_ATTEMPTS + 1):
+            try:
+                extracted_fields = self._parse_response(response_text, field_definitions)
+                break
+            except ExtractionError as e:
+                if attempt == PARSE_RETRY_ATTEMPTS:
+                    raise
+                
+                logger.warning("llm_response_retry", attempt=attempt + 1, error=str(e))
+                await asyncio.sleep(1.0 * (attempt + 1))
+                
+                response_text = await self._invoke_llm([
+                    HumanMessage(content=prompt),
+                    AIMessage(content=response_text),
+                    HumanMessage(content=(
+                        f"Your output had an error: {e}. "
+                        "Fix it and return ONLY the JSON array."
+                    )),
+                ], semaphore)
+        
+        # Only cache responses that parsed
+        if cache_key:
+            await llm_cache.set(cache_key, response_text)
         
         logger.info("extraction_completed", fields_extracted=len(extracted_fields))
         
         return extracted_fields
     
-    def _extract_chunked(
+    async def _invoke_llm(self, messages: Any, semaphore: asyncio.Semaphore) -> str:
+        """
+        Call the LLM within the concurrency limit and shared per-minute quota
+        
+        Args:
+            messages: Prompt string or list of chat messages
+            semaphore: Limits concurrent LLM calls
+        
+        Returns:
+            Response text
+        """
+        if isinstance(messages, str):
+            prompt_text = messages
+        else:
+            prompt_text = "".join(message.content for message in messages)
+        
+        async with semaphore:
+            await rate_limiter.acquire(rate_limiter.estimate_tokens(prompt_text))
+            response = await self.llm.ainvoke(messages)
+        
+        return response.content
+    
+    async def _extract_chunked(
         self,
         document_text: str,
         field_definitions: List[Dict[str, Any]],
-        chunk_size: int
+        field_groups: List[Tuple[List[Dict[str, Any]], Tuple[str, str]]],
+        semaphore: asyncio.Semaphore,
+        chunk_size: int,
+        use_cache: bool
     ) -> List[Dict[str, Any]]:
         """
         Extract fields from large documents using chunking strategy
@@ -142,43 +391,81 @@ class GeminiExtractor:
         Args:
             document_text: Full document text
             field_definitions: Field definitions
+            field_groups: (field definitions, prompt parts) per group
+            semaphore: Limits concurrent LLM calls
             chunk_size: Size of each chunk
-            
+            use_cache: Reuse cached LLM responses
+        
         Returns:
             Merged extraction results from all chunks
         """
         # Split document into overlapping chunks
-        chunks = self._create_chunks(document_text, chunk_size, overlap=500)
+        chunks = self._create_chunks(document_text, chunk_size)
         
         logger.info("processing_chunks", chunk_count=len(chunks))
         
-        # Extract from each chunk
-        all_extractions = []
-        for i, chunk in enumerate(chunks):
-            logger.info("processing_chunk", chunk_index=i, chunk_length=len(chunk))
-            
-            chunk_results = self._extract_single(chunk, field_definitions)
-            all_extractions.append(chunk_results)
+        # Extract from chunks concurrently; the calls are network-bound and
+        # the semaphore bounds how many are in flight
+        results = await asyncio.gather(*(
+            self._extract_chunk(i, chunk, field_groups, semaphore, use_cache)
+            for i, chunk in enumerate(chunks)
+        ))
+        
+        # gather keeps chunk order for merging; drop chunks that failed
+        all_extractions = [result for result in results if result is not None]
+        
+        if not all_extractions:
+            raise ExtractionError("Extraction failed for every document chunk")
         
         # Merge results with confidence-based selection
         merged_results = self._merge_chunk_results(all_extractions, field_definitions)
         
         return merged_results
     
-    def _build_extraction_prompt(
+    async def _extract_chunk(
+        self,
+        chunk_index: int,
+        chunk: str,
+        field_groups: List[Tuple[List[Dict[str, Any]], Tuple[str, str]]],
+        semaphore: asyncio.Semaphore,
+        use_cache: bool
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract fields from one chunk, isolating failures from other chunks
+        
+        Args:
+            chunk_index: Position of the chunk in the document
+            chunk: Chunk text
+            field_groups: (field definitions, prompt parts) per group
+            semaphore: Limits concurrent LLM calls
+            use_cache: Reuse cached LLM responses
+        
+        Returns:
+            List of extracted fields, or None if the chunk failed
+        """
+        logger.info("processing_chunk", chunk_index=chunk_index, chunk_length=len(chunk))
+        
+        try:
+            return await self._extract_single(chunk, field_groups, semaphore, use_cache)
+        except Exception as e:
+            logger.warning("chunk_extraction_failed", chunk_index=chunk_index, error=str(e))
+            return None
+    
+    def _build_prompt_template(
         self,
-        document_text: str,
         field_definitions: List[Dict[str, Any]]
-    ) -> str:
+    ) -> Tuple[str, str]:
         """
-        Build comprehensive extraction prompt
+        Build the field-dependent parts of the extraction prompt
+        
+        They depend only on the field definitions, so chunked extraction
+        builds them once and reuses them for every chunk.
         
         Args:
-            document_text: Document text to extract from
             field_definitions: Fields to extract
-            
+        
         Returns:
-            Formatted prompt string
+            Tuple of (text before the document, text after the document)
         """
         # Build field descriptions
         field_descriptions = []
@@ -188,7 +475,7 @@ class GeminiExtractor:
   - Type: {field['field_type']}
   - Required: {"Yes" if field.get('required', False) else "No"}
   - Description: {field.get('extraction_prompt', 'Extract this field value')}
-  - Validation: {json.dumps(field.get('validation_rules', {}))}
+  - Validation: {orjson.dumps(field.get('validation_rules', {})).decode()}
 """
             field_descriptions.append(field_desc.strip())
         
@@ -209,7 +496,7 @@ class GeminiExtractor:
                 ]
             })
         
-        prompt = f"""You are a legal document analysis AI specialized in extracting structured information from legal documents.
+        prefix = f"""You are a legal document analysis AI specialized in extracting structured information from legal documents.
 
 **TASK**: Extract the following fields from the provided document:
 
@@ -217,7 +504,9 @@ class GeminiExtractor:
 
 **DOCUMENT TEXT**:
 ```
-{document_text[:30000]}  
+"""
+
+        suffix = f"""  
 ```
 
 **EXTRACTION INSTRUCTIONS**:
@@ -232,7 +521,7 @@ class GeminiExtractor:
 
 **OUTPUT FORMAT** (JSON array):
 ```json
-{json.dumps(output_example, indent=2)}
+{orjson.dumps(output_example, option=orjson.OPT_INDENT_2).decode()}
 ```
 
 **IMPORTANT**:
@@ -244,8 +533,27 @@ class GeminiExtractor:
 **YOUR JSON OUTPUT**:
 ```json
 """
+
+        return prefix, suffix
+    
+    def _build_extraction_prompt(
+        self,
+        document_text: str,
+        prompt_template: Tuple[str, str]
+    ) -> str:
+        """
+        Build comprehensive extraction prompt
         
-        return prompt
+        Args:
+            document_text: Document text to extract from
+            prompt_template: Parts from _build_prompt_template
+        
+        Returns:
+            Formatted prompt string
+        """
+        # The whole text goes in; callers bound its size via chunking
+        prefix, suffix = prompt_template
+        return "".join((prefix, document_text, suffix))
     
     def _parse_response(
         self,
@@ -258,29 +566,30 @@ class GeminiExtractor:
         Args:
             response_text: Raw LLM response
             field_definitions: Expected field definitions
-            
+        
         Returns:
             List of extracted field dictionaries
         """
         try:
             # Extract JSON from response (handles markdown code blocks)
-            json_match = re.search(r'```(?:json)?\s*(\[.*?\])\s*```', response_text, re.DOTALL)
+            json_match = FENCED_JSON_ARRAY_RE.search(response_text)
             if json_match:
                 json_text = json_match.group(1)
             else:
                 # Try to find raw JSON array
-                json_match = re.search(r'(\[.*\])', response_text, re.DOTALL)
-                if json_match:
-                    json_text = json_match.group(1)
-                else:
+                json_text = _find_json_array(response_text)
+                if json_text is None:
                     raise ValueError("No JSON array found in response")
             
             # Parse JSON
-            extracted_data = json.loads(json_text)
+            extracted_data = orjson.loads(json_text)
             
             if not isinstance(extracted_data, list):
                 raise ValueError("Response is not a JSON array")
             
+            # Index definitions once instead of scanning them per item
+            field_defs_by_id = {f['field_id']: f for f in field_definitions}
+            
             # Validate and normalize
             validated_fields = []
             for item in extracted_data:
@@ -288,7 +597,7 @@ class GeminiExtractor:
                 if 'field_id' not in item:
                     continue
                 
-                field_def = next((f for f in field_definitions if f['field_id'] == item['field_id']), None)
+                field_def = field_defs_by_id.get(item['field_id'])
                 if not field_def:
                     continue
                 
@@ -308,8 +617,9 @@ class GeminiExtractor:
                 })
             
             # Ensure all fields are present
+            extracted_ids = {f['field_id'] for f in validated_fields}
             for field_def in field_definitions:
-                if not any(f['field_id'] == field_def['field_id'] for f in validated_fields):
+                if field_def['field_id'] not in extracted_ids:
                     validated_fields.append({
                         'field_id': field_def['field_id'],
                         'raw_value': None,
@@ -320,7 +630,7 @@ class GeminiExtractor:
             
             return validated_fields
         
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error("json_parsing_failed", error=str(e), response_preview=response_text[:500])
             raise ExtractionError(f"Failed to parse LLM response as JSON: {str(e)}")
         
@@ -341,7 +651,7 @@ class GeminiExtractor:
             raw_value: Raw extracted value
             field_type: Field type (TEXT, DATE, NUMBER, etc.)
             normalization_strategy: Custom normalization rules
-            
+        
         Returns:
             Normalized value
         """
@@ -357,14 +667,8 @@ class GeminiExtractor:
             if field_type == FieldType.DATE.value:
                 # Basic date normalization (YYYY-MM-DD format)
                 # Extract date patterns
-                date_patterns = [
-                    r'(\d{4})-(\d{2})-(\d{2})',  # 2024-01-15
-                    r'(\d{2})/(\d{2})/(\d{4})',  # 01/15/2024
-                    r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})',  # 15 January 2024
-                ]
-                
-                for pattern in date_patterns:
-                    match = re.search(pattern, raw_value, re.IGNORECASE)
+                for pattern in DATE_PATTERNS:
+                    match = pattern.search(raw_value)
                     if match:
                         return match.group(0)  # Return first matched date
                 
@@ -372,7 +676,7 @@ class GeminiExtractor:
             
             elif field_type == FieldType.NUMBER.value:
                 # Extract numeric value
-                number_match = re.search(r'-?[\d,]+\.?\d*', raw_value)
+                number_match = NUMBER_RE.search(raw_value)
                 if number_match:
                     # Remove commas and return
                     return number_match.group(0).replace(',', '')
@@ -381,16 +685,16 @@ class GeminiExtractor:
             elif field_type == FieldType.BOOLEAN.value:
                 # Normalize to true/false
                 lower_val = raw_value.lower()
-                if lower_val in ['yes', 'true', '1', 'y']:
+                if lower_val in BOOLEAN_TRUE_VALUES:
                     return 'true'
-                elif lower_val in ['no', 'false', '0', 'n']:
+                elif lower_val in BOOLEAN_FALSE_VALUES:
                     return 'false'
                 return raw_value
             
             elif field_type == FieldType.LIST.value:
                 # Ensure comma-separated format
                 if ',' in raw_value or ';' in raw_value:
-                    items = re.split(r'[,;]', raw_value)
+                    items = LIST_SEPARATOR_RE.split(raw_value)
                     return ', '.join(item.strip() for item in items if item.strip())
                 return raw_value
             
@@ -408,31 +712,59 @@ class GeminiExtractor:
         self,
         text: str,
         chunk_size: int,
-        overlap: int = 500
+        overlap: Optional[int] = None
     ) -> List[str]:
         """
-        Split text into overlapping chunks
+        Split text into overlapping chunks, cutting on natural boundaries
+        
+        Each chunk ends at the last paragraph break, sentence end or line
+        break in its second half (a hard cut only if there is none), so
+        chunks don't start or end mid-sentence and a small overlap suffices.
         
         Args:
             text: Full text
             chunk_size: Maximum size of each chunk
             overlap: Number of characters to overlap between chunks
-            
+                (default CHUNK_OVERLAP, capped at a quarter of chunk_size)
+        
         Returns:
             List of text chunks
+        
+        Raises:
+            ValueError: If overlap is not smaller than chunk_size
         """
+        if overlap is None:
+            overlap = min(CHUNK_OVERLAP, chunk_size // 4)
+        if overlap >= chunk_size:
+            raise ValueError(f"Chunk overlap ({overlap}) must be smaller than chunk size ({chunk_size})")
+        
         chunks = []
         start = 0
+        text_length = len(text)
         
-        while start < len(text):
+        while start < text_length:
             end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            
-            if end >= len(text):
+            if end >= text_length:
+                chunks.append(text[start:])
                 break
             
-            start = end - overlap
+            min_end = start + chunk_size // 2
+            for separator in CHUNK_SEPARATORS:
+                cut = text.rfind(separator, min_end, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+            
+            chunks.append(text[start:end])
+            
+            # Begin the overlap at a line start when one is close by; the
+            # search stays inside this chunk so a negative bound can't wrap
+            # around to the end of the text
+            next_start = max(end - overlap, start + 1)
+            line_break = text.rfind('\n', max(next_start - overlap, start + 1), next_start)
+            if line_break != -1:
+                next_start = line_break + 1
+            start = next_start
         
         return chunks
     
@@ -449,25 +781,28 @@ class GeminiExtractor:
         Args:
             chunk_results: List of extraction results from each chunk
             field_definitions: Field definitions
-            
+        
         Returns:
             Merged extraction results
         """
-        merged = []
+        # Single pass keeping the highest-confidence non-empty value per field
+        # (first seen wins ties, as chunks are in document order)
+        best: Dict[str, Dict[str, Any]] = {}
+        for chunk_result in chunk_results:
+            for field_data in chunk_result:
+                if not field_data.get('raw_value'):
+                    continue
+                field_id = field_data['field_id']
+                current = best.get(field_id)
+                if current is None or \
+                        field_data.get('confidence_score', 0) > current.get('confidence_score', 0):
+                    best[field_id] = field_data
         
+        merged = []
         for field_def in field_definitions:
             field_id = field_def['field_id']
-            
-            # Collect all extractions for this field
-            field_extractions = []
-            for chunk_result in chunk_results:
-                field_data = next((f for f in chunk_result if f['field_id'] == field_id), None)
-                if field_data and field_data.get('raw_value'):
-                    field_extractions.append(field_data)
-            
-            # Select best extraction (highest confidence)
-            if field_extractions:
-                best_extraction = max(field_extractions, key=lambda x: x.get('confidence_score', 0))
+            best_extraction = best.get(field_id)
+            if best_extraction is not None:
                 merged.append(best_extraction)
             else:
                 # No extraction found in any chunk
@@ -480,3 +815,28 @@ class GeminiExtractor:
                 })
         
         return merged
+
+
+_extractor: Optional[GeminiExtractor] = None
+_extractor_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_extractor() -> GeminiExtractor:
+    """
+    Get the process-wide extractor, creating it on first use
+    
+    Celery worker processes reuse one LLM client across tasks instead of
+    constructing it per document. The client's async transport is bound to
+    the process loop from get_loop(), so the extractor is rebuilt whenever
+    that loop is replaced (after a fork) rather than reused across loops.
+    
+    Raises:
+        ExtractionError: If LangChain or GEMINI_API_KEY is missing
+    """
+    global _extractor, _extractor_loop
+    
+    loop = get_loop()
+    if _extractor is None or _extractor_loop is not loop:
+        _extractor = GeminiExtractor()
+        _extractor_loop = loop
+    return _extractor
@@ -0,0 +1,56 @@
+"""
+Field Template Cache
+Process-local cache of template field definitions keyed by (id, version)
+"""
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import hashlib
+
+from cachetools import TTLCache
+import orjson
+
+# Templates are immutable per version, so a stale entry can only be an
+# unused old version; the TTL just bounds memory for those.
+_cache: TTLCache = TTLCache(maxsize=256, ttl=300)
+_lock = Lock()
+
+
+def compute_fields_hash(fields_json: List[Dict[str, Any]]) -> str:
+    """
+    Hash field definitions for cheap change detection
+    
+    Args:
+        fields_json: Field definitions as stored on the template
+        
+    Returns:
+        str: SHA-256 hex digest of the key-sorted JSON encoding
+    """
+    return hashlib.sha256(orjson.dumps(fields_json, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def get_fields(template_id: UUID, version: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get cached field definitions for a template version
+    
+    Args:
+        template_id: UUID of the field template
+        version: Template version
+        
+    Returns:
+        Field definitions, or None on a cache miss
+    """
+    with _lock:
+        return _cache.get((template_id, version))
+
+
+def set_fields(template_id: UUID, version: int, fields: List[Dict[str, Any]]) -> None:
+    """Seed the cache with a template version's field definitions"""
+    with _lock:
+        _cache[(template_id, version)] = fields
+
+
+def evict(template_id: UUID, version: int) -> None:
+    """Drop a template version from the cache"""
+    with _lock:
+        _cache.pop((template_id, version), None)
@@ -0,0 +1,82 @@
+"""
+LLM Response Cache
+Content-addressed Redis cache of raw LLM responses
+
+Keys are a SHA-256 over the model, temperature and full prompt (which
+embeds the document text and field definitions), so any change to the
+inputs or to the prompt template produces a new key. Whitespace runs are
+collapsed before hashing, so re-exports that differ only in spacing or
+line breaks share an entry. Redis failures are logged and treated as
+cache misses.
+"""
+from typing import Optional
+import asyncio
+import hashlib
+import re
+
+import redis
+import redis.asyncio as aioredis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_client: Optional[aioredis.Redis] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _get_client() -> aioredis.Redis:
+    # Async connections belong to the loop that opened them
+    global _client, _client_loop
+    
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = aioredis.from_url(settings.LLM_CACHE_REDIS_URL or settings.REDIS_URL)
+        _client_loop = loop
+    return _client
+
+
+def make_key(model: str, temperature: float, prompt: str) -> str:
+    """
+    Build the cache key for an LLM call
+    
+    Each component is length-prefixed so that different splits of the
+    same bytes cannot collide. The prompt is hashed with whitespace runs
+    collapsed to a single space.
+    
+    Args:
+        model: LLM model name
+        temperature: Sampling temperature
+        prompt: Full prompt text
+    
+    Returns:
+        Redis key for the response
+    """
+    digest = hashlib.sha256()
+    normalized_prompt = WHITESPACE_RE.sub(' ', prompt).strip()
+    for component in (model, repr(temperature), normalized_prompt):
+        data = component.encode()
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return f"llm:{digest.hexdigest()}"
+
+
+async def get(key: str) -> Optional[str]:
+    """Get a cached response, or None on a miss"""
+    try:
+        value = await _get_client().get(key)
+    except redis.RedisError as e:
+        logger.warning("llm_cache_unavailable", error=str(e))
+        return None
+    return value.decode() if value is not None else None
+
+
+async def set(key: str, response_text: str) -> None:
+    """Cache a response for LLM_CACHE_TTL_DAYS"""
+    try:
+        await _get_client().set(key, response_text, ex=settings.LLM_CACHE_TTL_DAYS * 86400)
+    except redis.RedisError as e:
+        logger.warning("llm_cache_unavailable", error=str(e))
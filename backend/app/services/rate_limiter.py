@@ -0,0 +1,91 @@
+"""
+LLM Rate Limiter
+Redis-backed per-minute request and token budgets shared by all workers
+
+Every LLM call reserves one request and its estimated prompt tokens in the
+current minute's window. When either budget is spent, callers wait for the
+next window instead of sending requests that would come back as 429s and
+be retried. Redis failures are logged and let the call through.
+"""
+from typing import Optional
+import asyncio
+import random
+import time
+
+import redis
+import redis.asyncio as aioredis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Reserve a request and tokens in the window, or reserve nothing
+_RESERVE_SCRIPT = """
+local requests = redis.call('INCR', KEYS[1])
+local tokens = redis.call('INCRBY', KEYS[2], ARGV[1])
+if redis.call('TTL', KEYS[1]) < 0 then redis.call('EXPIRE', KEYS[1], 120) end
+if redis.call('TTL', KEYS[2]) < 0 then redis.call('EXPIRE', KEYS[2], 120) end
+if requests > tonumber(ARGV[2]) or tokens > tonumber(ARGV[3]) then
+    redis.call('DECR', KEYS[1])
+    redis.call('DECRBY', KEYS[2], ARGV[1])
+    return 0
+end
+return 1
+"""
+
+_client: Optional[aioredis.Redis] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_reserve = None
+
+
+def _get_reserve():
+    # Async connections belong to the loop that opened them
+    global _client, _client_loop, _reserve
+    
+    loop = asyncio.get_running_loop()
+    if _reserve is None or _client_loop is not loop:
+        _client = aioredis.from_url(settings.REDIS_URL)
+        _client_loop = loop
+        _reserve = _client.register_script(_RESERVE_SCRIPT)
+    return _reserve
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough prompt token count (about four characters per token)"""
+    return len(prompt) // 4 + 1
+
+
+async def acquire(tokens: int) -> None:
+    """
+    Wait until the current minute has room for one request of `tokens`
+    
+    Args:
+        tokens: Estimated prompt tokens for the call
+    """
+    if not settings.GEMINI_RPM and not settings.GEMINI_TPM:
+        return
+    
+    max_requests = settings.GEMINI_RPM or 2**31
+    max_tokens = settings.GEMINI_TPM or 2**62
+    # A single call larger than the whole budget still has to go through
+    tokens = min(tokens, max_tokens)
+    
+    while True:
+        window = int(time.time() // 60)
+        try:
+            granted = await _get_reserve()(
+                keys=[f"llm:rl:{window}:req", f"llm:rl:{window}:tok"],
+                args=[tokens, max_requests, max_tokens]
+            )
+        except redis.RedisError as e:
+            logger.warning("llm_rate_limiter_unavailable", error=str(e))
+            return
+        
+        if granted:
+            return
+        
+        # Wait for the next window; jitter spreads the waiting workers out
+        delay = 60 - time.time() % 60 + random.uniform(0, 1)
+        logger.info("llm_rate_limited", tokens=tokens, wait_seconds=round(delay, 1))
+        await asyncio.sleep(delay)
@@ -0,0 +1,80 @@
+"""
+Review Table Cache
+Redis read-through cache for project review tables
+
+Each project has a version counter in Redis; cached tables are keyed by
+that version. Writes that change a project's table bump the counter, so
+old entries are never read again and simply expire. Redis failures are
+logged and treated as cache misses.
+"""
+from typing import Optional, Tuple
+from uuid import UUID
+
+import redis
+import redis.asyncio as aioredis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Safety net for any write path that does not bump the version
+CACHE_TTL = 300
+
+_async_client = aioredis.from_url(settings.REDIS_URL)
+_sync_client: Optional[redis.Redis] = None
+
+
+def _version_key(project_id: UUID) -> str:
+    return f"rt:{project_id}:ver"
+
+
+async def get_table(project_id: UUID) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Look up the cached review table for a project
+    
+    Args:
+        project_id: UUID of the project
+    
+    Returns:
+        Tuple of (cached JSON payload or None, key to store a fresh
+        payload under or None if Redis is unavailable)
+    """
+    try:
+        version = await _async_client.get(_version_key(project_id))
+        key = f"rt:{project_id}:v{int(version or 0)}"
+        return await _async_client.get(key), key
+    except redis.RedisError as e:
+        logger.warning("review_cache_unavailable", project_id=str(project_id), error=str(e))
+        return None, None
+
+
+async def set_table(key: str, payload: bytes) -> None:
+    """Store a serialized review table under a key from get_table"""
+    try:
+        await _async_client.set(key, payload, ex=CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning("review_cache_unavailable", key=key, error=str(e))
+
+
+async def invalidate(*project_ids: UUID) -> None:
+    """Bump the version of each project's review table"""
+    try:
+        async with _async_client.pipeline(transaction=False) as pipe:
+            for project_id in project_ids:
+                pipe.incr(_version_key(project_id))
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("review_cache_invalidate_failed", error=str(e))
+
+
+def invalidate_sync(project_id: UUID) -> None:
+    """Bump a project's review table version from a Celery worker"""
+    global _sync_client
+    
+    try:
+        if _sync_client is None:
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+        _sync_client.incr(_version_key(project_id))
+    except redis.RedisError as e:
+        logger.warning("review_cache_invalidate_failed", project_id=str(project_id), error=str(e))
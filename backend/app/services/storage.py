@@ -0,0 +1,218 @@
+"""
+Object Storage Service
+Optional S3 backend for uploaded documents (enabled when S3_BUCKET is set)
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple
+import hashlib
+import tempfile
+
+from fastapi import UploadFile
+import structlog
+
+# S3 clients
+try:
+    import aioboto3
+    import boto3
+    HAS_BOTO3 = True
+except ImportError:
+    HAS_BOTO3 = False
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+S3_URI_PREFIX = "s3://"
+
+# S3 rejects multipart parts smaller than 5MB (except the last one)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class StorageError(Exception):
+    """Custom exception for object storage errors"""
+    pass
+
+
+class FileTooLargeError(StorageError):
+    """Raised when an upload exceeds MAX_UPLOAD_SIZE"""
+    pass
+
+
+def s3_enabled() -> bool:
+    """Return True if uploads should be stored in S3"""
+    return bool(settings.S3_BUCKET)
+
+
+def is_s3_uri(path: str) -> bool:
+    """Return True if a stored file path points at S3"""
+    return path.startswith(S3_URI_PREFIX)
+
+
+def _split_s3_uri(uri: str) -> Tuple[str, str]:
+    """Split 's3://bucket/key' into (bucket, key)"""
+    bucket, _, key = uri[len(S3_URI_PREFIX):].partition("/")
+    return bucket, key
+
+
+def _client_kwargs() -> dict:
+    """Shared keyword arguments for S3 clients"""
+    kwargs = {"region_name": settings.S3_REGION}
+    if settings.S3_ENDPOINT_URL:
+        kwargs["endpoint_url"] = settings.S3_ENDPOINT_URL
+    return kwargs
+
+
+def _require_boto3() -> None:
+    if not HAS_BOTO3:
+        raise StorageError("aioboto3 library not installed. Cannot use S3 storage.")
+
+
+async def upload_to_s3(upload_file: UploadFile, key: str) -> Tuple[str, int, str]:
+    """
+    Stream an upload into S3 using a multipart upload
+    
+    Each chunk read from the request becomes one part, so the file never
+    touches local disk. The SHA-256 digest is computed on the same pass.
+    
+    Args:
+        upload_file: FastAPI UploadFile object
+        key: Object key within S3_BUCKET
+    
+    Returns:
+        Tuple of (s3 URI, file size in bytes, SHA-256 hex digest)
+    
+    Raises:
+        FileTooLargeError: If file exceeds max size
+        StorageError: If boto3 is not installed
+    """
+    _require_boto3()
+    
+    bucket = settings.S3_BUCKET
+    part_size = max(settings.UPLOAD_CHUNK_SIZE, S3_MIN_PART_SIZE)
+    session = aioboto3.Session()
+    
+    async with session.client("s3", **_client_kwargs()) as s3:
+        multipart = await s3.create_multipart_upload(Bucket=bucket, Key=key)
+        upload_id = multipart["UploadId"]
+        
+        parts = []
+        file_size = 0
+        digest = hashlib.sha256()
+        aborted = False
+        
+        try:
+            while chunk := await upload_file.read(part_size):
+                file_size += len(chunk)
+                
+                # Check file size limit
+                if file_size > settings.MAX_UPLOAD_SIZE:
+                    raise FileTooLargeError(
+                        f"File exceeds maximum size of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+                    )
+                
+                digest.update(chunk)
+                part_number = len(parts) + 1
+                part = await s3.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    PartNumber=part_number,
+                    UploadId=upload_id,
+                    Body=chunk
+                )
+                parts.append({"ETag": part["ETag"], "PartNumber": part_number})
+            
+            if not parts:
+                # A multipart upload needs at least one part
+                aborted = True
+                await s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+                await s3.put_object(Bucket=bucket, Key=key, Body=b"")
+            else:
+                await s3.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts}
+                )
+        
+        except BaseException:
+            # Discard uploaded parts so they are not billed (once; the
+            # empty-file path has already aborted before its put_object)
+            if not aborted:
+                await s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            raise
+    
+    logger.info("s3_upload_completed", key=key, file_size=file_size, part_count=len(parts))
+    
+    return f"{S3_URI_PREFIX}{bucket}/{key}", file_size, digest.hexdigest()
+
+
+async def delete_from_s3(uri: str) -> None:
+    """
+    Delete a stored object
+    
+    Args:
+        uri: s3:// URI of the object
+    """
+    _require_boto3()
+    
+    bucket, key = _split_s3_uri(uri)
+    session = aioboto3.Session()
+    
+    async with session.client("s3", **_client_kwargs()) as s3:
+        await s3.delete_object(Bucket=bucket, Key=key)
+
+
+async def presigned_download_url(uri: str, filename: str) -> str:
+    """
+    Create a time-limited download URL for a stored object
+    
+    Args:
+        uri: s3:// URI of the object
+        filename: Filename presented to the client
+    
+    Returns:
+        Presigned GET URL
+    """
+    _require_boto3()
+    
+    bucket, key = _split_s3_uri(uri)
+    session = aioboto3.Session()
+    
+    async with session.client("s3", **_client_kwargs()) as s3:
+        return await s3.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": key,
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=settings.S3_PRESIGNED_URL_TTL
+        )
+
+
+@contextmanager
+def local_copy(file_path: str) -> Iterator[str]:
+    """
+    Yield a local filesystem path for a stored file
+    
+    Local paths are yielded unchanged. S3 objects are downloaded to a
+    temporary file (keeping the extension for parser dispatch) that is
+    removed on exit. Used by synchronous Celery workers.
+    
+    Args:
+        file_path: Local path or s3:// URI
+    """
+    if not is_s3_uri(file_path):
+        yield file_path
+        return
+    
+    _require_boto3()
+    
+    bucket, key = _split_s3_uri(file_path)
+    s3 = boto3.client("s3", **_client_kwargs())
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir) / Path(key).name
+        s3.download_file(bucket, key, str(tmp_path))
+        yield str(tmp_path)
@@ -3,6 +3,7 @@ Celery Application Configuration
 Async task processing for document parsing and extraction
 """
 from celery import Celery
+from kombu import Queue
 import structlog
 
 from app.core.config import settings
@@ -22,14 +23,32 @@ celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
+    result_expires=3600,  # Results are small status dicts nobody polls; don't keep them a day
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
     task_time_limit=settings.EXTRACTION_TIMEOUT,
     task_soft_time_limit=settings.EXTRACTION_TIMEOUT - 30,
+    worker_concurrency=settings.CELERY_WORKER_CONCURRENCY or None,  # None lets Celery use cpu_count()
     worker_prefetch_multiplier=1,
+    # Ack after the task finishes so a worker lost mid-extraction requeues it
+    # (tasks are idempotent: they look up or update existing records)
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
     worker_max_tasks_per_child=50,
+    # Separate queues so slow LLM extractions don't hold up parsing;
+    # each can get its own worker pool via `celery worker -Q <queue>`.
+    # A worker started without -Q consumes all of them.
+    task_queues=(Queue("parse"), Queue("extract"), Queue("control")),
+    task_default_queue="control",
+    task_routes={
+        "parse_document_task": {"queue": "parse"},
+        "extract_document_task": {"queue": "extract"},
+        "extract_documents_batch_task": {"queue": "extract"},
+        "re_extract_project_task": {"queue": "control"},
+    },
     broker_connection_retry_on_startup=True,
+    broker_pool_limit=settings.CELERY_BROKER_POOL_LIMIT,  # Reuse producer connections across publishes
 )
 
 logger.info("celery_app_configured", broker=settings.CELERY_BROKER_URL)
@@ -2,30 +2,164 @@
 Celery Tasks
 Background tasks for document processing and extraction
 """
-from celery import shared_task
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+import asyncio
+
+from celery import group, shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from kombu.exceptions import OperationalError
+from sqlalchemy import cast, create_engine, func, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.orm import sessionmaker
 import structlog
 from uuid import UUID
 
 from app.core.config import settings
-from app.models import Document, UploadStatus, ExtractedRecord, ExtractionStatus
-from app.services.document_parser import DocumentParser, DocumentParserError
+from app.db.session import json_kwargs, pool_kwargs
+from app.models import Document, FieldTemplate, Project, UploadStatus, ExtractedRecord, ExtractionStatus
+from app.services import field_template_cache, review_cache
+from app.services.document_parser import DocumentParserError, document_parser
+from app.services.extractor import ExtractionError, get_extractor, run_sync
+from app.services.storage import local_copy
 
 logger = structlog.get_logger(__name__)
 
-# Create synchronous database engine for Celery workers
-sync_engine = create_engine(settings.DATABASE_URL_SYNC, pool_pre_ping=True)
+# Create synchronous database engine for Celery workers; each worker process
+# keeps its connection open across tasks. A prefork process runs one task at
+# a time, so it needs a single pooled connection (plus one spare), not the
+# API's per-process budget.
+if settings.DB_USE_NULL_POOL:
+    worker_pool_kwargs = pool_kwargs
+else:
+    worker_pool_kwargs = {**pool_kwargs, "pool_size": 1, "max_overflow": 1}
+
+sync_engine = create_engine(
+    settings.DATABASE_URL_SYNC,
+    pool_pre_ping=True,
+    **json_kwargs,
+    **worker_pool_kwargs,
+)
+
+# Tasks commit several times and keep using the loaded objects afterwards,
+# so don't expire them (each expiry means another SELECT on next access)
+SyncSessionLocal = sessionmaker(
+    sync_engine,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+# Parsed text digest computed by PostgreSQL (same value as hashing the
+# UTF-8 text in Python), so workers can decide whether a document needs
+# extracting without loading multi-MB text or building an encoded copy
+PARSED_TEXT_SHA256 = func.encode(func.sha256(func.convert_to(Document.parsed_text, "UTF8")), "hex")
 
 
 def get_sync_db():
     """Get synchronous database session for Celery tasks"""
-    db = Session(sync_engine)
-    try:
-        return db
-    except Exception as e:
-        db.close()
-        raise
+    return SyncSessionLocal()
+
+
+def _retry_countdown(task) -> int:
+    """
+    Seconds to wait before retrying an extraction task
+    
+    Doubles from the task's default_retry_delay on each retry, capped at
+    EXTRACTION_RETRY_BACKOFF_MAX, with full jitter so tasks that failed
+    together (e.g. during a Gemini outage) don't retry in lockstep.
+    """
+    return get_exponential_backoff_interval(
+        factor=task.default_retry_delay,
+        retries=task.request.retries,
+        maximum=settings.EXTRACTION_RETRY_BACKOFF_MAX,
+        full_jitter=True
+    )
+
+
+def _load_template_fields(db, template_id: UUID) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get a field template's field definitions, from the cache when possible
+    
+    Args:
+        db: Synchronous database session
+        template_id: UUID of field template
+    
+    Returns:
+        List of field definitions, or None if the template does not exist
+    """
+    version = db.query(FieldTemplate.version).filter(FieldTemplate.id == template_id).scalar()
+    if version is None:
+        return None
+    
+    template_fields = field_template_cache.get_fields(template_id, version)
+    if template_fields is None:
+        # Read version alongside fields so a concurrent edit is cached correctly
+        version, template_fields = db.query(FieldTemplate.version, FieldTemplate.fields).filter(
+            FieldTemplate.id == template_id
+        ).one()
+        field_template_cache.set_fields(template_id, version, template_fields)
+    
+    return template_fields
+
+
+def _start_extractions(
+    db,
+    text_hashes: Dict[UUID, str],
+    template_id: UUID,
+    template_hash: str,
+    force: bool = False
+) -> Dict[UUID, ExtractedRecord]:
+    """
+    Create or reset extraction records as IN_PROGRESS in one statement
+    
+    Uses INSERT ... ON CONFLICT DO UPDATE against the unique
+    (document_id, field_template_id) index, so concurrent runs for the
+    same pair update one row. Records already COMPLETED from the same
+    parsed text and template fields are left untouched and not returned,
+    so callers skip the LLM for them, unless force is set. The caller
+    commits.
+    
+    Args:
+        db: Synchronous database session
+        text_hashes: SHA-256 of each document's parsed text, keyed by document UUID
+        template_id: UUID of field template
+        template_hash: Hash of the template fields (compute_fields_hash)
+        force: Reset and return every record, even unchanged completed ones
+    
+    Returns:
+        Extraction records that need extracting, keyed by document ID
+    """
+    stmt = pg_insert(ExtractedRecord).values([
+        {
+            "document_id": document_id,
+            "field_template_id": template_id,
+            "extraction_status": ExtractionStatus.IN_PROGRESS,
+            "text_sha256": text_hash,
+            "template_sha256": template_hash
+        }
+        for document_id, text_hash in text_hashes.items()
+    ])
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExtractedRecord.document_id, ExtractedRecord.field_template_id],
+        set_={
+            "extraction_status": excluded.extraction_status,
+            "text_sha256": excluded.text_sha256,
+            "template_sha256": excluded.template_sha256,
+            "error_message": None,
+            "updated_at": excluded.updated_at,
+        },
+        where=None if force else or_(
+            ExtractedRecord.extraction_status != ExtractionStatus.COMPLETED,
+            ExtractedRecord.text_sha256.is_distinct_from(excluded.text_sha256),
+            ExtractedRecord.template_sha256.is_distinct_from(excluded.template_sha256)
+        )
+    )
+    records = db.scalars(
+        stmt.returning(ExtractedRecord),
+        execution_options={"populate_existing": True}
+    )
+    return {record.document_id: record for record in records}
 
 
 @shared_task(bind=True, name="parse_document_task", max_retries=3, default_retry_delay=60)
@@ -35,62 +169,83 @@ def parse_document_task(self, document_id: str):
     
     Args:
         document_id: UUID of document to parse
-        
+    
     Process:
         1. Update status to PARSING
         2. Parse document using DocumentParser
         3. Save parsed text and metadata
         4. Update status to PARSED or FAILED
     """
-    logger.info("parsing_document_task_started", document_id=document_id, task_id=self.request.id)
+    log = logger.bind(task_id=self.request.id, document_id=document_id)
+    log.info("parsing_document_task_started")
+    
+    # Parse the ID once; a malformed one is not worth retrying
+    try:
+        doc_uuid = UUID(document_id)
+    except ValueError:
+        log.error("invalid_document_id")
+        return {"status": "error", "message": "Invalid document ID"}
     
     db = get_sync_db()
+    document = None
     
     try:
-        # Get document from database
-        document = db.query(Document).filter(Document.id == UUID(document_id)).first()
+        # Flip status to PARSING and load the document in one round-trip.
+        # Already-parsed documents are left alone, so a redelivered task
+        # (acks_late) doesn't redo the parse.
+        document = db.scalars(
+            update(Document)
+            .where(Document.id == doc_uuid, Document.upload_status != UploadStatus.PARSED)
+            .values(upload_status=UploadStatus.PARSING)
+            .returning(Document)
+        ).first()
         
         if not document:
-            logger.error("document_not_found", document_id=document_id)
-            return {"status": "error", "message": "Document not found"}
+            if db.query(Document.id).filter(Document.id == doc_uuid).first() is None:
+                log.error("document_not_found")
+                return {"status": "error", "message": "Document not found"}
+            
+            log.info("document_already_parsed")
+            return {"status": "skipped", "document_id": document_id}
         
-        # Update status to PARSING
-        document.upload_status = UploadStatus.PARSING
         db.commit()
         
-        logger.info("parsing_started", document_id=document_id, file_path=document.file_path)
-        
-        # Parse document
-        parser = DocumentParser()
-        result = parser.parse(document.file_path)
-        
-        # Update document with parsed data
-        document.parsed_text = result['text']
-        
-        # Merge metadata
-        existing_metadata = document.file_metadata or {}
-        existing_metadata.update(result['metadata'])
-        document.file_metadata = existing_metadata
-        
-        document.upload_status = UploadStatus.PARSED
-        document.error_message = None
-        
+        log.info("parsing_started", file_path=document.file_path)
+        
+        # Parse document (S3-backed files are fetched to a temp copy first)
+        with local_copy(document.file_path) as local_path:
+            result = document_parser.parse(local_path)
+        
+        # Update document with parsed data; metadata is merged server-side
+        # with jsonb || so upload-time keys are kept without a read-back
+        db.execute(
+            update(Document)
+            .where(Document.id == doc_uuid)
+            .values(
+                parsed_text=result['text'],
+                file_metadata=func.coalesce(Document.file_metadata, cast({}, JSONB))
+                .op("||", return_type=JSONB)(cast(result['metadata'], JSONB)),
+                upload_status=UploadStatus.PARSED,
+                error_message=None
+            )
+            .execution_options(synchronize_session=False)
+        )
         db.commit()
         
-        logger.info("parsing_document_task_completed", 
-                   document_id=document_id,
-                   text_length=len(result['text']),
-                   word_count=result['metadata'].get('word_count', 0))
+        log.info("parsing_document_task_completed",
+                text_length=len(result['text']),
+                word_count=result['metadata'].get('word_count', 0))
         
         # Auto-trigger extraction if project has field template
-        if document.project and document.project.field_template_id:
-            logger.info("auto_triggering_extraction", 
-                       document_id=document_id,
-                       template_id=str(document.project.field_template_id))
+        field_template_id = db.query(Project.field_template_id).filter(
+            Project.id == document.project_id
+        ).scalar()
+        if field_template_id:
+            log.info("auto_triggering_extraction", template_id=str(field_template_id))
             
             extract_document_task.delay(
                 document_id,
-                str(document.project.field_template_id)
+                str(field_template_id)
             )
         
         return {
@@ -101,11 +256,10 @@ def parse_document_task(self, document_id: str):
         }
     
     except DocumentParserError as e:
-        logger.error("parsing_failed", document_id=document_id, error=str(e))
+        log.error("parsing_failed", error=str(e))
         
-        # Update document status
-        document = db.query(Document).filter(Document.id == UUID(document_id)).first()
-        if document:
+        # Update document status (still loaded, parsing runs after the fetch)
+        if document is not None:
             document.upload_status = UploadStatus.FAILED
             document.error_message = f"Parsing failed: {str(e)}"
             db.commit()
@@ -113,12 +267,13 @@ def parse_document_task(self, document_id: str):
         return {"status": "error", "message": str(e)}
     
     except Exception as e:
-        logger.error("parsing_document_task_failed", document_id=document_id, error=str(e), exc_info=True)
+        log.error("parsing_document_task_failed", error=str(e), exc_info=True)
         
         # Update document status
         try:
-            document = db.query(Document).filter(Document.id == UUID(document_id)).first()
-            if document:
+            # Discard a failed flush; the document stays in the identity map
+            db.rollback()
+            if document is not None:
                 document.upload_status = UploadStatus.FAILED
                 document.error_message = f"Unexpected error: {str(e)}"
                 db.commit()
@@ -133,14 +288,15 @@ def parse_document_task(self, document_id: str):
 
 
 @shared_task(bind=True, name="extract_document_task", max_retries=3, default_retry_delay=120)
-def extract_document_task(self, document_id: str, field_template_id: str):
+def extract_document_task(self, document_id: str, field_template_id: str, force: bool = False):
     """
     Extract fields from parsed document using Gemini LLM
     
     Args:
         document_id: UUID of document
         field_template_id: UUID of field template
-        
+        force: Re-extract even if unchanged, bypassing the LLM cache
+    
     Process:
         1. Get document and field template
         2. Create or update ExtractedRecord with IN_PROGRESS status
@@ -148,72 +304,77 @@ def extract_document_task(self, document_id: str, field_template_id: str):
         4. Save extracted fields
         5. Update status to COMPLETED or FAILED
     """
-    logger.info("extraction_task_started", 
-               document_id=document_id, 
-               template_id=field_template_id, 
-               task_id=self.request.id)
+    log = logger.bind(task_id=self.request.id, document_id=document_id, template_id=field_template_id)
+    log.info("extraction_task_started")
+    
+    # Parse the IDs once; malformed ones are not worth retrying
+    try:
+        doc_uuid = UUID(document_id)
+        template_uuid = UUID(field_template_id)
+    except ValueError:
+        log.error("invalid_id")
+        return {"status": "error", "message": "Invalid document or template ID"}
     
     db = get_sync_db()
+    # Bound before the try so the handlers can check what was loaded
+    document = None
+    extracted_record = None
     
     try:
-        from app.models import FieldTemplate
-        from app.services.extractor import GeminiExtractor, ExtractionError
-        
-        # Get document
-        document = db.query(Document).filter(Document.id == UUID(document_id)).first()
+        # Get document status and text digest; the text itself is only
+        # loaded if the document needs extracting
+        document = db.execute(
+            select(
+                Document.project_id,
+                Document.upload_status,
+                func.length(Document.parsed_text).label("text_length"),
+                PARSED_TEXT_SHA256.label("text_sha256")
+            ).where(Document.id == doc_uuid)
+        ).first()
         if not document:
-            logger.error("document_not_found", document_id=document_id)
+            log.error("document_not_found")
             return {"status": "error", "message": "Document not found"}
         
         # Check if document is parsed
         if document.upload_status != UploadStatus.PARSED:
-            logger.warning("document_not_parsed", 
-                         document_id=document_id,
-                         status=document.upload_status.value)
+            log.warning("document_not_parsed", status=document.upload_status.value)
             return {"status": "error", "message": "Document not yet parsed"}
         
-        if not document.parsed_text:
-            logger.error("no_parsed_text", document_id=document_id)
+        if not document.text_length:
+            log.error("no_parsed_text")
             return {"status": "error", "message": "No parsed text available"}
         
-        # Get field template
-        template = db.query(FieldTemplate).filter(
-            FieldTemplate.id == UUID(field_template_id)
-        ).first()
+        # Get field template fields
+        template_fields = _load_template_fields(db, template_uuid)
         
-        if not template:
-            logger.error("template_not_found", template_id=field_template_id)
+        if template_fields is None:
+            log.error("template_not_found")
             return {"status": "error", "message": "Field template not found"}
         
-        # Get or create ExtractedRecord
-        extracted_record = db.query(ExtractedRecord).filter(
-            ExtractedRecord.document_id == UUID(document_id),
-            ExtractedRecord.field_template_id == UUID(field_template_id)
-        ).first()
+        # Create or reset ExtractedRecord, unless it is already complete for
+        # the same text and fields (and the run isn't forced)
+        template_hash = field_template_cache.compute_fields_hash(template_fields)
+        extracted_record = _start_extractions(
+            db, {doc_uuid: document.text_sha256}, template_uuid, template_hash, force
+        ).get(doc_uuid)
+        db.commit()
         
-        if not extracted_record:
-            extracted_record = ExtractedRecord(
-                document_id=UUID(document_id),
-                field_template_id=UUID(field_template_id),
-                extraction_status=ExtractionStatus.IN_PROGRESS
-            )
-            db.add(extracted_record)
-        else:
-            extracted_record.extraction_status = ExtractionStatus.IN_PROGRESS
-            extracted_record.error_message = None
+        if extracted_record is None:
+            log.info("extraction_skipped_unchanged")
+            return {"status": "skipped", "document_id": document_id}
         
-        db.commit()
+        review_cache.invalidate_sync(document.project_id)
         
-        logger.info("extraction_started", 
-                   document_id=document_id,
-                   text_length=len(document.parsed_text),
-                   field_count=len(template.fields))
+        log.info("extraction_started",
+                text_length=document.text_length,
+                field_count=len(template_fields))
         
         # Extract fields using Gemini
-        extractor = GeminiExtractor()
-        extracted_fields = extractor.extract(
-            document_text=document.parsed_text,
-            field_definitions=template.fields
+        document_text = db.scalar(select(Document.parsed_text).where(Document.id == doc_uuid))
+        extracted_fields = get_extractor().extract(
+            document_text=document_text,
+            field_definitions=template_fields,
+            use_cache=not force
         )
         
         # Update extracted record
@@ -222,16 +383,21 @@ def extract_document_task(self, document_id: str, field_template_id: str):
         extracted_record.error_message = None
         
         db.commit()
-        
-        # Calculate statistics
-        fields_with_values = sum(1 for f in extracted_fields if f.get('raw_value'))
-        avg_confidence = sum(f.get('confidence_score', 0) for f in extracted_fields) / len(extracted_fields) if extracted_fields else 0
-        
-        logger.info("extraction_task_completed", 
-                   document_id=document_id,
-                   fields_extracted=fields_with_values,
-                   total_fields=len(extracted_fields),
-                   avg_confidence=avg_confidence)
+        review_cache.invalidate_sync(document.project_id)
+        
+        # Calculate statistics in one pass over the fields
+        fields_with_values = 0
+        total_confidence = 0
+        for f in extracted_fields:
+            if f.get('raw_value'):
+                fields_with_values += 1
+            total_confidence += f.get('confidence_score', 0)
+        avg_confidence = total_confidence / len(extracted_fields) if extracted_fields else 0
+        
+        log.info("extraction_task_completed",
+                fields_extracted=fields_with_values,
+                total_fields=len(extracted_fields),
+                avg_confidence=avg_confidence)
         
         return {
             "status": "success",
@@ -242,33 +408,204 @@ def extract_document_task(self, document_id: str, field_template_id: str):
         }
     
     except ExtractionError as e:
-        logger.error("extraction_failed", document_id=document_id, error=str(e))
+        log.error("extraction_failed", error=str(e))
         
         # Update record status
-        if extracted_record:
+        if extracted_record is not None:
             extracted_record.extraction_status = ExtractionStatus.FAILED
             extracted_record.error_message = f"Extraction failed: {str(e)}"
             db.commit()
+            review_cache.invalidate_sync(document.project_id)
         
         return {"status": "error", "message": str(e)}
     
     except Exception as e:
-        logger.error("extraction_task_failed", 
-                    document_id=document_id, 
-                    error=str(e), 
-                    exc_info=True)
+        log.error("extraction_task_failed", 
+                 error=str(e), 
+                 exc_info=True)
         
         # Update record status
         try:
-            if extracted_record:
+            # Discard a failed flush; the record stays in the identity map
+            db.rollback()
+            if extracted_record is not None:
                 extracted_record.extraction_status = ExtractionStatus.FAILED
                 extracted_record.error_message = f"Unexpected error: {str(e)}"
                 db.commit()
+                review_cache.invalidate_sync(document.project_id)
         except:
             pass
         
-        # Retry task
-        raise self.retry(exc=e)
+        # Retry task with exponential backoff
+        raise self.retry(exc=e, countdown=_retry_countdown(self))
+    
+    finally:
+        db.close()
+
+
+# The global task_time_limit is sized for one document; a batch gets the
+# same allowance per document it may extract
+BATCH_TIME_LIMIT = settings.EXTRACTION_TIMEOUT * settings.EXTRACTION_BATCH_SIZE
+
+
+@shared_task(
+    bind=True,
+    name="extract_documents_batch_task",
+    max_retries=3,
+    default_retry_delay=120,
+    time_limit=BATCH_TIME_LIMIT,
+    soft_time_limit=BATCH_TIME_LIMIT - 30
+)
+def extract_documents_batch_task(self, document_ids: List[str], field_template_id: str, force: bool = False):
+    """
+    Extract fields from several parsed documents in one task
+    
+    Used by re_extract_project_task. The documents share one extractor
+    (and its HTTP client), are extracted concurrently in one event loop,
+    and their records are written in one transaction.
+    
+    Args:
+        document_ids: UUIDs of documents
+        field_template_id: UUID of field template
+        force: Re-extract even if unchanged, bypassing the LLM cache
+    """
+    log = logger.bind(task_id=self.request.id, template_id=field_template_id)
+    log.info("batch_extraction_task_started", document_count=len(document_ids))
+    
+    # Parse the IDs once; malformed ones are not worth retrying
+    try:
+        doc_uuids = [UUID(document_id) for document_id in document_ids]
+        template_uuid = UUID(field_template_id)
+    except ValueError:
+        log.error("invalid_id")
+        return {"status": "error", "message": "Invalid document or template ID"}
+    
+    db = get_sync_db()
+    # Bound before the try so the handler can release what was claimed
+    records: Dict[UUID, ExtractedRecord] = {}
+    project_ids = set()
+    
+    try:
+        template_fields = _load_template_fields(db, template_uuid)
+        
+        if template_fields is None:
+            log.error("template_not_found")
+            return {"status": "error", "message": "Field template not found"}
+        
+        # Documents that were re-uploaded or emptied since queuing are skipped
+        documents = db.query(
+            Document.id, Document.project_id, PARSED_TEXT_SHA256.label("text_sha256")
+        ).filter(
+            Document.id.in_(doc_uuids),
+            Document.upload_status == UploadStatus.PARSED,
+            Document.parsed_text.isnot(None)
+        ).all()
+        
+        if not documents:
+            return {"status": "success", "documents_extracted": 0, "documents_failed": 0}
+        
+        # Mark every record IN_PROGRESS in one statement; documents already
+        # extracted from the same text and fields are dropped from the batch
+        template_hash = field_template_cache.compute_fields_hash(template_fields)
+        records = _start_extractions(
+            db,
+            {document.id: document.text_sha256 for document in documents},
+            template_uuid,
+            template_hash,
+            force
+        )
+        db.commit()
+        
+        skipped_count = len(documents) - len(records)
+        documents = [document for document in documents if document.id in records]
+        if not documents:
+            log.info("batch_extraction_skipped_unchanged", documents_skipped=skipped_count)
+            return {
+                "status": "success",
+                "documents_extracted": 0,
+                "documents_failed": 0,
+                "documents_skipped": skipped_count
+            }
+        
+        project_ids = {document.project_id for document in documents}
+        for project_id in project_ids:
+            review_cache.invalidate_sync(project_id)
+        
+        # Load the text only for documents that are being extracted
+        texts = dict(db.query(Document.id, Document.parsed_text).filter(Document.id.in_(list(records))).all())
+        
+        # Extract all documents concurrently; one failure doesn't fail the batch
+        extractor = get_extractor()
+        
+        async def _extract_all():
+            return await asyncio.gather(
+                *(
+                    extractor.aextract(texts[document.id], template_fields, use_cache=not force)
+                    for document in documents
+                ),
+                return_exceptions=True
+            )
+        
+        results = run_sync(_extract_all())
+        
+        extracted_count = 0
+        for document, result in zip(documents, results):
+            record = records[document.id]
+            if isinstance(result, BaseException):
+                log.error("extraction_failed", document_id=str(document.id), error=str(result))
+                record.extraction_status = ExtractionStatus.FAILED
+                record.error_message = f"Extraction failed: {str(result)}"
+            else:
+                record.extracted_fields = result
+                record.extraction_status = ExtractionStatus.COMPLETED
+                record.error_message = None
+                extracted_count += 1
+        
+        db.commit()
+        for project_id in project_ids:
+            review_cache.invalidate_sync(project_id)
+        
+        log.info("batch_extraction_task_completed",
+                documents_extracted=extracted_count,
+                documents_failed=len(documents) - extracted_count,
+                documents_skipped=skipped_count)
+        
+        return {
+            "status": "success",
+            "documents_extracted": extracted_count,
+            "documents_failed": len(documents) - extracted_count,
+            "documents_skipped": skipped_count
+        }
+    
+    except Exception as e:
+        log.error("batch_extraction_task_failed", 
+                 error=str(e), 
+                 exc_info=True)
+        
+        # On the last attempt, fail the records this batch claimed so they
+        # don't stay IN_PROGRESS (and count as pending) forever
+        if records and self.request.retries >= self.max_retries:
+            try:
+                db.rollback()
+                db.execute(
+                    update(ExtractedRecord)
+                    .where(
+                        ExtractedRecord.id.in_([record.id for record in records.values()]),
+                        ExtractedRecord.extraction_status == ExtractionStatus.IN_PROGRESS
+                    )
+                    .values(
+                        extraction_status=ExtractionStatus.FAILED,
+                        error_message=f"Unexpected error: {str(e)}"
+                    )
+                )
+                db.commit()
+                for project_id in project_ids:
+                    review_cache.invalidate_sync(project_id)
+            except:
+                pass
+        
+        # Retry task with exponential backoff
+        raise self.retry(exc=e, countdown=_retry_countdown(self))
     
     finally:
         db.close()
@@ -282,57 +619,81 @@ def re_extract_project_task(self, project_id: str):
     
     Args:
         project_id: UUID of project
-        
+    
     Process:
         1. Get all parsed documents in project
-        2. Queue extraction task for each document
+        2. Queue batched extraction tasks for the documents
     """
-    logger.info("re_extraction_task_started", project_id=project_id, task_id=self.request.id)
+    log = logger.bind(task_id=self.request.id, project_id=project_id)
+    log.info("re_extraction_task_started")
+    
+    # Parse the ID once; a malformed one is not worth retrying
+    try:
+        project_uuid = UUID(project_id)
+    except ValueError:
+        log.error("invalid_project_id")
+        return {"status": "error", "message": "Invalid project ID"}
     
     db = get_sync_db()
     
     try:
-        from app.models import Project
-        
         # Get project
-        project = db.query(Project).filter(Project.id == UUID(project_id)).first()
+        project = db.get(Project, project_uuid)
         
         if not project:
-            logger.error("project_not_found", project_id=project_id)
+            log.error("project_not_found")
             return {"status": "error", "message": "Project not found"}
         
         if not project.field_template_id:
-            logger.warning("no_template", project_id=project_id)
+            log.warning("no_template")
             return {"status": "error", "message": "Project has no field template"}
         
-        # Get all parsed documents
-        documents = db.query(Document).filter(
-            Document.project_id == UUID(project_id),
-            Document.upload_status == UploadStatus.PARSED
-        ).all()
-        
-        logger.info("queuing_extractions", 
-                   project_id=project_id,
-                   document_count=len(documents))
+        # Get IDs of all parsed documents (only the key, not parsed_text)
+        document_ids = list(db.scalars(
+            select(Document.id).where(
+                Document.project_id == project_uuid,
+                Document.upload_status == UploadStatus.PARSED
+            )
+        ))
+        
+        log.info("queuing_extractions", document_count=len(document_ids))
+        
+        # Pre-create PENDING records in one statement so progress is visible
+        # before the extraction tasks are picked up. Pairs that already have
+        # a record (or get one from a concurrent task) are left alone.
+        if document_ids:
+            db.execute(
+                pg_insert(ExtractedRecord).values([
+                    {
+                        "document_id": document_id,
+                        "field_template_id": project.field_template_id,
+                        "extraction_status": ExtractionStatus.PENDING
+                    }
+                    for document_id in document_ids
+                ]).on_conflict_do_nothing(
+                    index_elements=[ExtractedRecord.document_id, ExtractedRecord.field_template_id]
+                )
+            )
+            db.commit()
         
-        # Queue extraction tasks
-        queued_count = 0
-        for document in documents:
-            try:
-                extract_document_task.delay(
-                    str(document.id),
-                    str(project.field_template_id)
+        # Queue one extraction task per batch of documents, published
+        # together over one producer connection
+        template_id = str(project.field_template_id)
+        batch_size = settings.EXTRACTION_BATCH_SIZE
+        try:
+            group(
+                extract_documents_batch_task.s(
+                    [str(document_id) for document_id in document_ids[i:i + batch_size]],
+                    template_id
                 )
-                queued_count += 1
-            except Exception as e:
-                logger.error("task_queue_failed", 
-                           document_id=str(document.id),
-                           error=str(e))
-                continue
+                for i in range(0, len(document_ids), batch_size)
+            ).apply_async()
+        except OperationalError as e:
+            log.error("task_queue_failed", error=str(e))
+            return {"status": "error", "message": "Failed to queue extraction tasks"}
+        queued_count = len(document_ids)
         
-        logger.info("re_extraction_task_completed", 
-                   project_id=project_id,
-                   queued_count=queued_count)
+        log.info("re_extraction_task_completed", queued_count=queued_count)
         
         return {
             "status": "success",
@@ -341,10 +702,9 @@ def re_extract_project_task(self, project_id: str):
         }
     
     except Exception as e:
-        logger.error("re_extraction_task_failed", 
-                    project_id=project_id, 
-                    error=str(e), 
-                    exc_info=True)
+        log.error("re_extraction_task_failed", 
+                 error=str(e), 
+                 exc_info=True)
         raise
     
     finally:
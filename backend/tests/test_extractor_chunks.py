@@ -0,0 +1,45 @@
+"""
+Tests for GeminiExtractor._create_chunks
+"""
+import pytest
+
+from app.services.extractor import GeminiExtractor
+
+
+def _create_chunks(text, chunk_size, overlap=None):
+    # Chunking doesn't touch the LLM client, so skip __init__
+    extractor = GeminiExtractor.__new__(GeminiExtractor)
+    return extractor._create_chunks(text, chunk_size, overlap)
+
+
+def _assert_covers(text, chunks, chunk_size):
+    """Each chunk continues at or before the end of the previous one"""
+    covered = 0
+    for chunk in chunks:
+        assert len(chunk) <= chunk_size
+        position = text.rfind(chunk, 0, covered + len(chunk))
+        assert 0 <= position <= covered
+        covered = position + len(chunk)
+    assert covered == len(text)
+
+
+@pytest.mark.parametrize("text, chunk_size, overlap", [
+    ("x\n" * 1000, 100, None),
+    ("x\n" * 1000, 100, 90),
+    ("Clause one applies. " * 500, 300, None),
+    ("Section\n\nThe parties agree. Terms follow.\n" * 300, 1000, None),
+    ("y" * 1234, 151, 150),
+])
+def test_chunks_cover_all_text(text, chunk_size, overlap):
+    chunks = _create_chunks(text, chunk_size, overlap)
+    
+    _assert_covers(text, chunks, chunk_size)
+
+
+def test_short_text_is_one_chunk():
+    assert _create_chunks("short text", 100) == ["short text"]
+
+
+def test_overlap_must_be_smaller_than_chunk_size():
+    with pytest.raises(ValueError):
+        _create_chunks("x" * 500, 100, 100)